@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any
-import json
+from fastapi import APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
+import contextlib
+import orjson
 from datetime import datetime
 
 from ..models.conversation import ConversationRequest, ConversationResponse, ConversationUpdate, ConversationStatus
@@ -13,53 +14,157 @@ from ..services.logging_service import get_logging_service
 from ..config import settings
 
 
-def json_serializer(obj):
-    """datetime 객체를 JSON 직렬화 가능한 형태로 변환"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# 응답 본문은 orjson(C 구현)으로 직렬화
+router = APIRouter(default_response_class=ORJSONResponse)
 
-router = APIRouter()
+# 대화 조회 스트리밍 시 한 번에 전송하는 메시지 조각 수
+STREAM_CHUNK_MESSAGES = 128
 
 # 로깅 서비스 초기화
 logging_service = get_logging_service()
 
+# 응답에 포함하는 정보성 타임스탬프 - 요청마다 포맷하지 않고 1초마다 갱신
+_now_iso = datetime.now().isoformat()
+_clock_task: Optional[asyncio.Task] = None
+
+
+async def _tick_clock():
+    global _now_iso
+    while True:
+        _now_iso = datetime.now().isoformat()
+        await asyncio.sleep(1)
+
+
+async def start_clock():
+    """타임스탬프 갱신 태스크 시작 (앱 lifespan에서 호출)"""
+    global _clock_task
+    _clock_task = asyncio.create_task(_tick_clock())
+
+
+async def stop_clock():
+    """타임스탬프 갱신 태스크 종료 (앱 lifespan에서 호출)"""
+    global _clock_task
+    if _clock_task is not None:
+        _clock_task.cancel()
+        _clock_task = None
+
 # WebSocket 연결 관리
 class ConnectionManager:
+    """연결별 송신 큐와 writer 태스크로 WebSocket 프레임을 전송
+
+    broadcast는 큐에 넣기만 하고, writer가 큐에 쌓인 메시지를 모아
+    JSON 배열 프레임 하나로 전송한다 (토큰 스트림 시 send 호출 수 절감).
+    """
+
+    # writer가 한 프레임에 묶는 최대 메시지 수
+    MAX_BATCH = 64
+    # 연결별 송신 대기 한도 (초과 시 느린 클라이언트로 보고 연결 해제)
+    MAX_PENDING = 1000
+    # 첫 메시지 이후 추가 메시지를 기다리는 시간 (초)
+    FLUSH_INTERVAL = 0.002
+    # 송신 큐 초과(느린 클라이언트) / 전송 실패로 연결을 끊을 때의 종료 코드
+    CLOSE_TRY_AGAIN_LATER = 1013
+    CLOSE_INTERNAL_ERROR = 1011
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # 연결 -> 송신 큐 (삽입 순서 유지, O(1) 제거)
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        # 진행 중인 소켓 종료 태스크 (완료 전에 가비지 컬렉션되지 않도록 참조 유지)
+        self._closing: set = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=self.MAX_PENDING)
+        self.active_connections[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
         logging_service.log_info("WebSocket 연결 추가", {
             "connection_count": len(self.active_connections)
         })
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if self.active_connections.pop(websocket, None) is None:
+            return
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
         logging_service.log_info("WebSocket 연결 제거", {
             "connection_count": len(self.active_connections)
         })
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        logging_service.log_info("WebSocket 브로드캐스트 시작", {
+    def _drop(self, websocket: WebSocket, code: int):
+        """연결을 목록에서 제거하고 소켓도 닫음 (클라이언트가 onclose로 끊김을 알고 재연결하도록)"""
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close(websocket, code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int):
+        # 이미 끊어진 소켓이면 close도 실패할 수 있으므로 오류는 무시
+        with contextlib.suppress(Exception):
+            await websocket.close(code=code)
+
+    def send_personal_message(self, payload: bytes, websocket: WebSocket):
+        self._enqueue(websocket, (1, payload))
+
+    def broadcast(self, payload: bytes):
+        """직렬화된 페이로드를 모든 연결의 송신 큐에 추가 (한 번 인코딩한 버퍼를 공유)"""
+        self._broadcast_item((1, payload))
+
+    def broadcast_batch(self, payloads: List[bytes]):
+        """여러 페이로드를 하나의 조각으로 묶어 연결당 한 번만 큐에 추가"""
+        if len(payloads) == 1:
+            self._broadcast_item((1, payloads[0]))
+        elif payloads:
+            self._broadcast_item((len(payloads), b",".join(payloads)))
+
+    def _broadcast_item(self, item: Tuple[int, bytes]):
+        logging_service.log_debug("WebSocket 브로드캐스트 시작", {
             "connection_count": len(self.active_connections),
-            "message_length": len(message)
+            "message_count": item[0],
+            "message_length": len(item[1])
         })
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-                logging_service.log_debug("WebSocket 메시지 전송 성공")
-            except Exception as e:
-                logging_service.log_error("WebSocket 메시지 전송 실패", str(e), {
-                    "connection_count": len(self.active_connections)
-                })
-                # 연결이 끊어진 경우 제거
-                self.active_connections.remove(connection)
+        for connection in list(self.active_connections):
+            self._enqueue(connection, item)
+
+    def _enqueue(self, websocket: WebSocket, item: Tuple[int, bytes]):
+        # item: (메시지 수, 쉼표로 이어 붙인 JSON 값들)
+        queue = self.active_connections.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logging_service.log_warning("WebSocket 송신 큐 초과로 연결 해제", {
+                "connection_count": len(self.active_connections)
+            })
+            self._drop(websocket, self.CLOSE_TRY_AGAIN_LATER)
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """큐에 쌓인 메시지를 모아 한 프레임으로 전송"""
+        try:
+            while True:
+                batch = [await queue.get()]
+                if queue.empty():
+                    # 곧이어 들어오는 메시지(스트림 토큰 등)를 같은 프레임에 묶기 위해 잠시 대기
+                    await asyncio.sleep(self.FLUSH_INTERVAL)
+                while len(batch) < self.MAX_BATCH and not queue.empty():
+                    batch.append(queue.get_nowait())
+                if len(batch) == 1 and batch[0][0] == 1:
+                    frame = batch[0][1]
+                else:
+                    frame = b"[" + b",".join(fragment for _, fragment in batch) + b"]"
+                await websocket.send_bytes(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging_service.log_error("WebSocket 메시지 전송 실패", str(e), {
+                "connection_count": len(self.active_connections)
+            })
+            # 연결이 끊어진 경우 제거하고 소켓도 닫음
+            self.disconnect(websocket)
+            await self._close(websocket, self.CLOSE_INTERNAL_ERROR)
 
 manager = ConnectionManager()
 
@@ -72,30 +177,13 @@ def message_callback(conversation_id: str, message):
     # 메시지 타입 결정 (스트림 여부에 따라)
     message_type = "stream_update" if getattr(message, 'is_streaming', False) else "new_message"
     
-    # timestamp를 Unix timestamp로 변환
-    timestamp_value = message.timestamp
-    if hasattr(timestamp_value, 'timestamp'):
-        # datetime 객체인 경우 Unix timestamp로 변환
-        timestamp_value = timestamp_value.timestamp()
-    elif isinstance(timestamp_value, str):
-        # 문자열인 경우 파싱 후 변환
-        try:
-            from datetime import datetime
-            dt = datetime.fromisoformat(timestamp_value.replace('Z', '+00:00'))
-            timestamp_value = dt.timestamp()
-        except:
-            timestamp_value = datetime.now().timestamp()
-    elif not isinstance(timestamp_value, (int, float)):
-        # 기타 타입인 경우 현재 시간으로 설정
-        timestamp_value = datetime.now().timestamp()
-    
     message_data = {
         "type": message_type,
         "conversation_id": conversation_id,
         "message": {
             "agent_id": message.agent_id,
             "content": message.content,
-            "timestamp": timestamp_value,
+            "timestamp": message.timestamp,
             "turn_number": message.turn_number,
             "agent_name": agent_name,
             "is_streaming": getattr(message, 'is_streaming', False)
@@ -109,8 +197,24 @@ def message_callback(conversation_id: str, message):
         "turn_number": message.turn_number
     })
     
-    # 비동기로 브로드캐스트 실행 (커스텀 JSON 직렬화 사용)
-    asyncio.create_task(manager.broadcast(json.dumps(message_data, ensure_ascii=False, default=json_serializer)))
+    # 메시지당 한 번만 직렬화하여 모든 연결이 같은 버퍼를 공유
+    _pending.append(orjson.dumps(message_data))
+    if len(_pending) == 1:
+        # 같은 루프 틱에 생성된 메시지를 모아 한 번에 브로드캐스트
+        try:
+            asyncio.get_running_loop().call_soon(_flush_pending)
+        except RuntimeError:
+            _flush_pending()
+
+
+# 현재 루프 틱에서 브로드캐스트 대기 중인 페이로드
+_pending: List[bytes] = []
+
+
+def _flush_pending():
+    batch = _pending[:]
+    _pending.clear()
+    manager.broadcast_batch(batch)
 
 # 콜백 등록
 conversation_service.add_message_callback(message_callback)
@@ -126,19 +230,27 @@ async def root():
     }
 
 
+# (에이전트 스냅샷 버전, 직렬화된 응답 본문) - 스냅샷이 바뀌면 다시 생성
+_agents_body: Optional[Tuple[int, bytes]] = None
+
+
 @router.get("/agents", response_model=List[Agent])
 async def get_agents():
     """모든 에이전트 조회"""
-    return conversation_service.get_agents()
+    global _agents_body
+    agents, _ = conversation_service.get_agents_snapshot()
+    version = conversation_service.agents_version
+    if _agents_body is None or _agents_body[0] != version:
+        _agents_body = (version, orjson.dumps([agent.model_dump() for agent in agents]))
+    return Response(content=_agents_body[1], media_type="application/json")
 
 
 @router.get("/agents/{agent_id}", response_model=Agent)
 async def get_agent(agent_id: str):
     """특정 에이전트 조회"""
-    agents = conversation_service.get_agents()
-    for agent in agents:
-        if agent.id == agent_id:
-            return agent
+    agent = conversation_service.get_agent_by_id(agent_id)
+    if agent is not None:
+        return agent
     raise HTTPException(status_code=404, detail="에이전트를 찾을 수 없습니다.")
 
 
@@ -146,7 +258,8 @@ async def get_agent(agent_id: str):
 async def get_conversations():
     """모든 대화 조회"""
     conversations = conversation_service.get_all_conversations()
-    return [
+    # jsonable_encoder를 거치지 않고 orjson으로 바로 직렬화
+    return Response(content=orjson.dumps([
         {
             "id": conv.id,
             "title": conv.title,
@@ -159,7 +272,7 @@ async def get_conversations():
             "message_count": len(conv.messages)
         }
         for conv in conversations
-    ]
+    ]), media_type="application/json")
 
 
 @router.get("/conversations/{conversation_id}")
@@ -169,7 +282,10 @@ async def get_conversation(conversation_id: str):
     if not conversation:
         raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
     
-    return {
+    # 메시지마다 에이전트 목록을 다시 조회하지 않도록 한 번만 인덱싱
+    _, agents_by_id = conversation_service.get_agents_snapshot()
+    
+    header = orjson.dumps({
         "id": conversation.id,
         "title": conversation.title,
         "status": conversation.status,
@@ -177,19 +293,32 @@ async def get_conversation(conversation_id: str):
         "updated_at": conversation.updated_at,
         "agent_ids": conversation.agent_ids,
         "current_turn": conversation.current_turn,
-        "max_turns": conversation.max_turns,
-        "messages": [
-            {
+        "max_turns": conversation.max_turns
+    })
+    # 스트리밍 중 대화가 계속 진행될 수 있으므로 응답 시점의 상태를 고정
+    messages = list(conversation.messages)
+    agent_states = {agent_id: state.model_dump() for agent_id, state in conversation.agent_states.items()}
+    
+    async def body():
+        # 전체 메시지 dict를 한 번에 만들지 않고 청크 단위로 직렬화해 전송
+        chunk = [header[:-1], b',"messages":[']
+        for i, msg in enumerate(messages):
+            if i:
+                chunk.append(b",")
+            chunk.append(orjson.dumps({
                 "agent_id": msg.agent_id,
                 "content": msg.content,
-                "timestamp": msg.timestamp.timestamp() if hasattr(msg.timestamp, 'timestamp') else msg.timestamp,
+                "timestamp": msg.timestamp,
                 "turn_number": msg.turn_number or 0,
-                "agent_name": next((agent.name for agent in conversation_service.get_agents() if agent.id == msg.agent_id), "Unknown")
-            }
-            for msg in conversation.messages
-        ],
-        "agent_states": conversation.agent_states
-    }
+                "agent_name": agents_by_id[msg.agent_id].name if msg.agent_id in agents_by_id else "Unknown"
+            }))
+            if len(chunk) >= STREAM_CHUNK_MESSAGES:
+                yield b"".join(chunk)
+                chunk = []
+        chunk.append(b'],"agent_states":' + orjson.dumps(agent_states) + b"}")
+        yield b"".join(chunk)
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.post("/conversations", response_model=ConversationResponse)
@@ -197,9 +326,9 @@ async def create_conversation(request: ConversationRequest):
     """새로운 대화 생성"""
     try:
         # 에이전트 ID 검증
-        available_agents = [agent.id for agent in conversation_service.get_agents()]
+        _, available_agents = conversation_service.get_agents_snapshot()
         logging_service.log_debug("대화 생성 요청", {
-            "available_agents": available_agents,
+            "available_agents": sorted(available_agents),
             "request_agent_ids": request.agent_ids
         })
         
@@ -207,7 +336,7 @@ async def create_conversation(request: ConversationRequest):
             if agent_id not in available_agents:
                 logging_service.log_error("존재하지 않는 에이전트 ID", f"Agent ID: {agent_id}", {
                     "requested_agent_id": agent_id,
-                    "available_agents": available_agents
+                    "available_agents": sorted(available_agents)
                 })
                 raise HTTPException(
                     status_code=400, 
@@ -263,7 +392,7 @@ async def start_conversation(conversation_id: str):
             "conversation_id": conversation_id,
             "status": "active"
         }
-        await manager.broadcast(json.dumps(status_data, ensure_ascii=False, default=json_serializer))
+        manager.broadcast(orjson.dumps(status_data))
         
         return {
             "message": "대화가 시작되었습니다.",
@@ -376,15 +505,15 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # 클라이언트로부터 메시지 수신 (필요시)
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             # 연결 상태 메시지 전송
-            await manager.send_personal_message(
-                json.dumps({
+            manager.send_personal_message(
+                orjson.dumps({
                     "type": "connection_status",
                     "message": "연결됨",
-                    "timestamp": datetime.now()
-                }, ensure_ascii=False, default=json_serializer),
+                    "timestamp": _now_iso
+                }),
                 websocket
             )
             
@@ -397,18 +526,28 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 
+# 설정은 프로세스 수명 동안 바뀌지 않으므로 응답 본문을 한 번만 직렬화
+_CONFIG_BODY = orjson.dumps({
+    "llm_provider": settings.llm_provider,
+    "vllm_url": settings.vllm_url,
+    "vllm_model": settings.vllm_model,
+    "conversation_max_turns": settings.conversation_max_turns,
+    "conversation_turn_interval": settings.conversation_turn_interval,
+    "conversation_unlimited": settings.conversation_unlimited,
+    "enable_streaming": settings.enable_streaming
+})
+
+
 @router.get("/config")
 async def get_config():
     """현재 설정 정보 반환"""
-    return {
-        "llm_provider": settings.llm_provider,
-        "vllm_url": settings.vllm_url,
-        "vllm_model": settings.vllm_model,
-        "conversation_max_turns": settings.conversation_max_turns,
-        "conversation_turn_interval": settings.conversation_turn_interval,
-        "conversation_unlimited": settings.conversation_unlimited,
-        "enable_streaming": settings.enable_streaming
-    }
+    return Response(content=_CONFIG_BODY, media_type="application/json")
+
+
+_HEALTH_STATIC = {
+    "llm_provider": settings.llm_provider,
+    "memory_type": settings.memory_type
+}
 
 
 @router.get("/health")
@@ -416,7 +555,6 @@ async def health_check():
     """헬스 체크"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "llm_provider": settings.llm_provider,
-        "memory_type": settings.memory_type
+        "timestamp": _now_iso,
+        **_HEALTH_STATIC
     } 
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .cli_app import main
+from .cli_app import main, run
 
-__all__ = ['main'] 
\ No newline at end of file
+__all__ = ['main', 'run'] 
\ No newline at end of file
@@ -1,17 +1,15 @@
 import asyncio
-import json
+import functools
 import os
+import re
 import sys
-from typing import List, Optional
+import orjson
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
 from datetime import datetime
-from rich.console import Console
-from rich.table import Table
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.live import Live
-from rich.layout import Layout
-from rich.text import Text
 from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,11 +17,69 @@ sys.path.insert(0, project_root)
 
 from app.models.agent import Agent
 from app.models.conversation import ConversationRequest
-from app.services.conversation_service import ConversationService
 from app.config import settings
 
 console = Console()
 
+# 메인 메뉴의 고정 영역 (매 redraw마다 새로 만들지 않음)
+_MENU_HEADER = Panel.fit(
+    "[bold blue]AI Agent NPC 대화 시스템[/bold blue]\n"
+    "[dim]CLI 모드 - AI Agent들이 서로 대화하는 것을 모니터링하세요[/dim]",
+    border_style="blue"
+)
+_MENU_TEXT = (
+    "\n[bold]메뉴:[/bold]\n"
+    "1. 새 대화 생성\n"
+    "2. 대화 목록 보기\n"
+    "3. 대화 선택\n"
+    "4. 대화 시작/중지\n"
+    "5. 실시간 모니터링\n"
+    "6. 에이전트 정보 보기\n"
+    "7. LLM 연결 테스트\n"
+    "8. 종료"
+)
+_MENU_CHOICES = ("1", "2", "3", "4", "5", "6", "7", "8")
+
+# 화면에 그대로 출력하지 않을 설정 키
+_SENSITIVE_KEYS = frozenset({'api_key', 'openai_api_key', 'redis_url', 'postgres_url'})
+
+
+def _mask_secret(value) -> str:
+    """비밀 값은 앞 4자리와 끝 2자리만 표시 (짧은 값은 전체 가림)"""
+    value = str(value)
+    if len(value) <= 8:
+        return '***'
+    return value[:4] + '***' + value[-2:]
+
+
+# 대화 상태별 표시 색상
+_STATUS_COLOR: Mapping[str, str] = MappingProxyType({
+    'idle': 'yellow',
+    'active': 'green',
+    'paused': 'orange',
+    'stopped': 'red',
+    'ended': 'red',
+    'error': 'red'
+})
+
+
+@functools.lru_cache(maxsize=4)
+def _load_agents_cached(path: str, mtime_ns: int) -> Tuple[Agent, ...]:
+    """agents.json 파싱 결과 캐시 (경로와 수정 시각이 같으면 디스크를 다시 읽지 않음)"""
+    with open(path, "rb") as f:
+        agents_data = orjson.loads(f.read())
+    
+    return tuple(
+        Agent(
+            id=agent_id,
+            name=agent_data["name"],
+            personality=agent_data["personality"],
+            system_prompt=agent_data["system_prompt"],
+            description=agent_data["description"]
+        )
+        for agent_id, agent_data in agents_data["agents"].items()
+    )
+
 
 class CLIConversationViewer:
     """CLI 대화 뷰어"""
@@ -31,81 +87,94 @@ class CLIConversationViewer:
     def __init__(self):
         self.current_conversation = None
         self.is_running = False
+        # LLM 클라이언트/메모리 백엔드까지 끌어오는 무거운 import는 뷰어 생성 시점으로 지연
+        from app.services.conversation_service import ConversationService
         self.conversation_service = ConversationService()
         self.agents = self._load_agents()
+        # 에이전트 이름 -> 발화자 접두어 제거용 정규식
+        self._strip_cache: dict = {}
+        # 개발 모드에서만 agents.json 변경 감시
+        self._agents_observer = self._watch_agents_file() if settings.dev_mode else None
+    
+    def _watch_agents_file(self):
+        """agents.json 변경 시 에이전트 목록 다시 로드 (watchdog 설치 시에만 동작)"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            console.print("[dim]watchdog이 설치되지 않아 agents.json 자동 갱신을 사용하지 않습니다.[/dim]")
+            return None
+        
+        agents_path = os.path.abspath(os.path.join(project_root, "agents.json"))
+        viewer = self
+        
+        class AgentsFileHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # 편집기가 임시 파일 교체 방식으로 저장하는 경우도 포함
+                paths = (event.src_path, getattr(event, "dest_path", ""))
+                if agents_path in (os.path.abspath(path) for path in paths if path):
+                    _load_agents_cached.cache_clear()
+                    viewer.agents = viewer._load_agents()
+        
+        observer = Observer()
+        observer.schedule(AgentsFileHandler(), os.path.dirname(agents_path), recursive=False)
+        observer.daemon = True
+        observer.start()
+        return observer
+    
+    def close(self):
+        """뷰어 정리 (파일 감시 중지)"""
+        if self._agents_observer is not None:
+            self._agents_observer.stop()
+            self._agents_observer = None
     
     def _load_agents(self) -> List[Agent]:
         """에이전트 설정 로드"""
         try:
             agents_path = os.path.join(project_root, "agents.json")
-            with open(agents_path, "r", encoding="utf-8") as f:
-                agents_data = json.load(f)
-            
-            agents = []
-            for agent_id, agent_data in agents_data["agents"].items():
-                agent = Agent(
-                    id=agent_id,
-                    name=agent_data["name"],
-                    personality=agent_data["personality"],
-                    system_prompt=agent_data["system_prompt"],
-                    description=agent_data["description"]
-                )
-                agents.append(agent)
-            
-            return agents
+            agents = list(_load_agents_cached(agents_path, os.stat(agents_path).st_mtime_ns))
             
         except Exception as e:
             console.print(f"[red]에이전트 설정 로드 오류: {str(e)}[/red]")
-            return []
+            agents = []
+        
+        # ID 조회/검증용 인덱스
+        self._agents_by_id = {agent.id: agent for agent in agents}
+        self._agent_id_set = frozenset(self._agents_by_id)
+        return agents
     
     async def show_main_menu(self):
         """메인 메뉴 표시"""
         while True:
             console.clear()
-            console.print(Panel.fit(
-                "[bold blue]AI Agent NPC 대화 시스템[/bold blue]\n"
-                "[dim]CLI 모드 - AI Agent들이 서로 대화하는 것을 모니터링하세요[/dim]",
-                border_style="blue"
-            ))
+            screen = [_MENU_HEADER]
             
             # 현재 상태 표시
             if self.current_conversation:
-                status_color = {
-                    'idle': 'yellow',
-                    'active': 'green',
-                    'paused': 'orange',
-                    'stopped': 'red',
-                    'ended': 'red',
-                    'error': 'red'
-                }.get(self.current_conversation.status, 'white')
+                status_color = _STATUS_COLOR.get(self.current_conversation.status, 'white')
                 
                 # 턴 정보 표시
                 max_turns_display = "무제한" if self.current_conversation.is_unlimited else str(self.current_conversation.max_turns)
                 
                 try:
-                    console.print(Panel(
+                    screen.append(Panel(
                         f"[bold]현재 대화:[/bold] {self.current_conversation.topic}\n"
                         f"[bold]상태:[/bold] [{status_color}]{self.current_conversation.status}[/{status_color}]\n"
                         f"[bold]턴:[/bold] {self.current_conversation.current_turn}/{max_turns_display}",
                         border_style=status_color
                     ))
                 except Exception as e:
-                    console.print(f"[bold]현재 대화:[/bold] {self.current_conversation.topic}")
-                    console.print(f"[bold]상태:[/bold] {self.current_conversation.status}")
-                    console.print(f"[bold]턴:[/bold] {self.current_conversation.current_turn}/{max_turns_display}")
+                    screen.append(
+                        f"[bold]현재 대화:[/bold] {self.current_conversation.topic}\n"
+                        f"[bold]상태:[/bold] {self.current_conversation.status}\n"
+                        f"[bold]턴:[/bold] {self.current_conversation.current_turn}/{max_turns_display}"
+                    )
             
-            # 메뉴 옵션
-            console.print("\n[bold]메뉴:[/bold]")
-            console.print("1. 새 대화 생성")
-            console.print("2. 대화 목록 보기")
-            console.print("3. 대화 선택")
-            console.print("4. 대화 시작/중지")
-            console.print("5. 실시간 모니터링")
-            console.print("6. 에이전트 정보 보기")
-            console.print("7. LLM 연결 테스트")
-            console.print("8. 종료")
+            # 메뉴 옵션 - 화면 전체를 한 번에 출력
+            screen.append(_MENU_TEXT)
+            console.print(Group(*screen))
             
-            choice = Prompt.ask("\n선택", choices=["1", "2", "3", "4", "5", "6", "7", "8"])
+            choice = Prompt.ask("\n선택", choices=_MENU_CHOICES)
             
             if choice == "1":
                 await self._create_conversation()
@@ -157,6 +226,7 @@ class CLIConversationViewer:
         )
         
         # 대화 생성
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -182,6 +252,7 @@ class CLIConversationViewer:
         console.print("all. 전체 선택 (단축)")
         
         # 에이전트 목록 표시
+        from rich.table import Table
         agent_table = Table(title="사용 가능한 에이전트")
         agent_table.add_column("ID", style="cyan")
         agent_table.add_column("이름", style="green")
@@ -197,9 +268,10 @@ class CLIConversationViewer:
             if agent_ids_input.strip() in ["0", "all"]:
                 return self.agents
             
-            agent_ids = [aid.strip() for aid in agent_ids_input.split(",") if aid.strip()]
-            if all(aid in [agent.id for agent in self.agents] for aid in agent_ids):
-                return [agent for agent in self.agents if agent.id in agent_ids]
+            # 중복 제거 후 입력 순서 유지
+            agent_ids = list(dict.fromkeys(aid.strip() for aid in agent_ids_input.split(",") if aid.strip()))
+            if self._agent_id_set.issuperset(agent_ids):
+                return [self._agents_by_id[aid] for aid in agent_ids]
             
             console.print("[red]잘못된 에이전트 ID가 포함되어 있습니다. 다시 입력하세요.[/red]")
     
@@ -238,13 +310,13 @@ class CLIConversationViewer:
                 await self.monitor_conversation()
                 return
             
-            # 대화 진행
+            # 대화 진행 (서비스가 보관한 객체를 그대로 참조하므로 한 번만 조회)
+            conversation = self.conversation_service.get_conversation(conversation_id)
+            if not conversation:
+                console.print("[red]대화를 찾을 수 없습니다.[/red]")
+                return
+            
             while True:
-                conversation = self.conversation_service.get_conversation(conversation_id)
-                if not conversation:
-                    console.print("[red]대화를 찾을 수 없습니다.[/red]")
-                    break
-                
                 # 대화 종료 조건 확인
                 if conversation.status == "ended":
                     console.print("\n[green]🏁 대화가 종료되었습니다.[/green]")
@@ -260,7 +332,7 @@ class CLIConversationViewer:
                     break
                 elif user_input == 'y':
                     # 대화 계속
-                    success = await self.conversation_service.continue_conversation(conversation_id)
+                    success, _ = await self.conversation_service.continue_conversation(conversation_id)
                     if not success:
                         console.print("[red]대화 진행에 실패했습니다.[/red]")
                         break
@@ -278,20 +350,13 @@ class CLIConversationViewer:
         """자동으로 대화 계속 진행 (별도 태스크)"""
         try:
             while True:
-                conversation = self.conversation_service.get_conversation(conversation_id)
-                if not conversation:
+                # 대화 간격 설정 (그 사이 중지/종료되면 바로 빠져나감)
+                if await self.conversation_service.wait_turn_interval(conversation_id):
                     break
                 
-                # 대화 종료 조건 확인
-                if conversation.status == "ended":
-                    break
-                
-                # 대화 간격 설정
-                await asyncio.sleep(settings.conversation_turn_interval)
-                
-                # 대화 계속
-                success = await self.conversation_service.continue_conversation(conversation_id)
-                if not success:
+                # 대화 계속 (서비스가 진행 후 상태를 함께 반환하므로 별도 조회 불필요)
+                success, status = await self.conversation_service.continue_conversation(conversation_id)
+                if not success or status == "ended":
                     break
                 
         except Exception as e:
@@ -310,6 +375,7 @@ class CLIConversationViewer:
             Prompt.ask("\n계속하려면 Enter를 누르세요")
             return
         
+        from rich.table import Table
         table = Table()
         table.add_column("ID", style="cyan", width=36)
         table.add_column("주제", style="green")
@@ -318,14 +384,7 @@ class CLIConversationViewer:
         table.add_column("생성일", style="white")
         
         for conv in conversations:
-            status_color = {
-                'idle': 'yellow',
-                'active': 'green',
-                'paused': 'orange',
-                'stopped': 'red',
-                'ended': 'red',
-                'error': 'red'
-            }.get(conv.status, 'white')
+            status_color = _STATUS_COLOR.get(conv.status, 'white')
             
             # 턴 정보 표시
             max_turns_display = "무제한" if conv.is_unlimited else str(conv.max_turns)
@@ -335,7 +394,7 @@ class CLIConversationViewer:
                 conv.topic,
                 f"[{status_color}]{conv.status}[/{status_color}]",
                 f"{conv.current_turn}/{max_turns_display}",
-                conv.created_at.strftime("%Y-%m-%d %H:%M")
+                conv.created_at.isoformat(sep=" ", timespec="minutes")
             )
         
         console.print(table)
@@ -357,8 +416,9 @@ class CLIConversationViewer:
             console.print(f"{i}. {conv.topic} ({conv.status})")
         console.print("0. 뒤로가기")
         
+        choices = tuple(str(i) for i in range(0, len(conversations) + 1))
         while True:
-            choice = Prompt.ask("\n선택", choices=[str(i) for i in range(0, len(conversations) + 1)])
+            choice = Prompt.ask("\n선택", choices=choices)
             if choice == "0":
                 return  # 뒤로가기
             try:
@@ -421,60 +481,33 @@ class CLIConversationViewer:
         console.print("[yellow]AI 에이전트들이 자동으로 대화를 진행합니다. Ctrl+C로 종료 가능합니다.[/yellow]\n")
         
         try:
-            # 실시간 모니터링 루프
-            last_message_count = len(self.current_conversation.messages)
+            # 실시간 모니터링 루프 - 새 메시지 이벤트를 기다렸다가 추가된 부분만 표시
+            conversation_id = self.current_conversation.id
+            cursor = len(self.current_conversation.messages)
+            new_message = self.conversation_service.get_message_event(conversation_id)
             
             while self.current_conversation.status == 'active':
-                await asyncio.sleep(1)
-                # 대화 상태 새로고침
-                self.current_conversation = self.conversation_service.get_conversation(self.current_conversation.id)
+                try:
+                    await asyncio.wait_for(new_message.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+                new_message.clear()
+                # current_conversation은 서비스가 갱신하는 객체와 같은 참조이므로 다시 조회하지 않음
                 
-                # 새 메시지 확인 및 표시
-                current_message_count = len(self.current_conversation.messages)
-                if current_message_count > last_message_count:
-                    # 새 메시지들 표시
-                    for i in range(last_message_count, current_message_count):
-                        message = self.current_conversation.messages[i]
-                        if message.speaker != "시스템":  # 시스템 메시지는 건너뛰기
-                            agent_name = message.speaker
-                            timestamp = message.timestamp.strftime("%H:%M:%S")
-                            
-                            # 메시지 내용에서 발화자 정보 중복 제거
-                            content = message.content
-                            patterns_to_remove = [
-                                f"[{agent_name}]",
-                                f"[{agent_name}] ",
-                                f"[{agent_name}]:",
-                                f"[{agent_name}]: ",
-                                f"{agent_name}:",
-                                f"{agent_name}: ",
-                                f"{agent_name}",
-                                f"{agent_name} ",
-                                f"[{agent_name}님]",
-                                f"[{agent_name}님] ",
-                                f"[{agent_name}님]:",
-                                f"[{agent_name}님]: ",
-                                f"{agent_name}님:",
-                                f"{agent_name}님: ",
-                                f"{agent_name}님",
-                                f"{agent_name}님 ",
-                                f"님",
-                                f"님 ",
-                                f"님:",
-                                f"님: "
-                            ]
-                            
-                            for pattern in patterns_to_remove:
-                                if content.startswith(pattern):
-                                    content = content[len(pattern):].strip()
-                                    break
-                            
-                            # 추가 정리: 줄 시작 부분의 불필요한 문자들 제거
-                            content = content.lstrip(": ").lstrip("- ").lstrip("* ")
-                            
-                            console.print(f"[{timestamp}] {agent_name}: {content}\n")
-                    
-                    last_message_count = current_message_count
+                # 커서 이후에 추가된 메시지만 가져와 한 번에 출력
+                new_messages, cursor = self.conversation_service.messages_since(conversation_id, cursor)
+                lines = []
+                for message in new_messages:
+                    if message.speaker != "시스템":  # 시스템 메시지는 건너뛰기
+                        agent_name = message.speaker
+                        timestamp = datetime.fromtimestamp(message.timestamp).strftime("%H:%M:%S")
+                        
+                        # 메시지 내용에서 발화자 정보 중복 제거
+                        content = self._strip_speaker_prefix(agent_name, message.content)
+                        
+                        lines.append(f"[{timestamp}] {agent_name}: {content}\n")
+                if lines:
+                    console.print("\n".join(lines))
                 
                 # 대화가 종료되었는지 확인
                 if self.current_conversation.status == 'ended':
@@ -487,9 +520,23 @@ class CLIConversationViewer:
         # 메인 메뉴로 자동 복귀
         return
     
+    def _strip_speaker_prefix(self, agent_name: str, content: str) -> str:
+        """메시지 앞의 발화자 표기([이름], 이름님: 등) 제거"""
+        pattern = self._strip_cache.get(agent_name)
+        if pattern is None:
+            name = re.escape(agent_name)
+            pattern = self._strip_cache.setdefault(
+                agent_name, re.compile(rf"^(?:\[{name}(?:님)?\]|{name}(?:님)?|님)\s*")
+            )
+        content = pattern.sub("", content, count=1)
+        
+        # 추가 정리: 줄 시작 부분의 불필요한 문자들 제거
+        return content.lstrip(": -*\t")
+    
     async def show_agents(self):
         """에이전트 정보 보기"""
         console.clear()
+        from rich.table import Table
         agent_table = Table(title="에이전트 정보")
         agent_table.add_column("ID", style="cyan")
         agent_table.add_column("이름", style="green")
@@ -513,14 +560,15 @@ class CLIConversationViewer:
             config = provider_info['config']
             console.print(f"[bold]설정 정보:[/bold]")
             for key, value in config.items():
-                if key == 'api_key' and value:
-                    console.print(f"  {key}: {'*' * 10} (설정됨)")
+                if key in _SENSITIVE_KEYS and value:
+                    console.print(f"  {key}: {_mask_secret(value)} (설정됨)")
                 else:
                     console.print(f"  {key}: {value}")
             
             console.print("\n[bold]연결 테스트 중...[/bold]")
             
             # 연결 테스트 실행
+            from rich.progress import Progress, SpinnerColumn, TextColumn
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
@@ -569,7 +617,23 @@ class CLIConversationViewer:
 async def main():
     """메인 함수"""
     viewer = CLIConversationViewer()
-    await viewer.show_main_menu()
+    try:
+        await viewer.show_main_menu()
+    finally:
+        # 백그라운드로 예약된 대화 저장을 마친 뒤 종료
+        await viewer.conversation_service.flush_pending_saves()
+        viewer.close()
+
+def run():
+    """CLI 실행 (uvloop가 설치돼 있으면 uvloop 이벤트 루프 사용)"""
+    try:
+        import uvloop
+    except ImportError:
+        # Windows 등 uvloop를 쓸 수 없는 환경은 기본 이벤트 루프 사용
+        asyncio.run(main())
+        return
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        runner.run(main())
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    run() 
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Tuple
 
 class LoggingConfig:
     """로깅 설정"""
@@ -11,7 +12,85 @@ class LoggingConfig:
         self.format = config_data.get("format", "json")
         self.include_agent_conversations = config_data.get("include_agent_conversations", True)
 
-class Settings(BaseSettings):
+_TRUE_VALUES = frozenset({"1", "on", "t", "true", "y", "yes"})
+_FALSE_VALUES = frozenset({"0", "off", "f", "false", "n", "no"})
+
+
+def _parse_bool(value: str) -> bool:
+    """환경변수 문자열을 bool로 변환"""
+    lowered = value.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"bool 값으로 해석할 수 없습니다: {value!r}")
+
+
+# 필수 항목 표시
+_REQUIRED = object()
+
+# (필드명, 환경변수명, 변환 함수, 기본값)
+_FIELDS: Tuple[Tuple[str, str, Callable[[str], Any], Any], ...] = (
+    # 서버 설정
+    ("host", "HOST", str, _REQUIRED),
+    ("port", "PORT", int, _REQUIRED),
+    ("debug", "DEBUG", _parse_bool, _REQUIRED),
+    # LLM 설정
+    ("llm_provider", "LLM_PROVIDER", str, _REQUIRED),
+    ("vllm_url", "VLLM_URL", str, _REQUIRED),
+    ("vllm_model", "VLLM_MODEL", str, _REQUIRED),
+    ("vllm_max_tokens", "VLLM_MAX_TOKENS", int, _REQUIRED),
+    ("vllm_temperature", "VLLM_TEMPERATURE", float, _REQUIRED),
+    ("vllm_top_p", "VLLM_TOP_P", float, _REQUIRED),
+    ("vllm_frequency_penalty", "VLLM_FREQUENCY_PENALTY", float, _REQUIRED),
+    ("vllm_presence_penalty", "VLLM_PRESENCE_PENALTY", float, _REQUIRED),
+    ("openai_api_key", "OPENAI_API_KEY", str, None),
+    ("openai_model", "OPENAI_MODEL", str, None),
+    ("ollama_url", "OLLAMA_URL", str, None),
+    ("ollama_model", "OLLAMA_MODEL", str, None),
+    # 대화 설정
+    ("conversation_max_turns", "CONVERSATION_MAX_TURNS", int, _REQUIRED),
+    ("conversation_turn_interval", "CONVERSATION_TURN_INTERVAL", float, _REQUIRED),
+    ("conversation_history_limit", "CONVERSATION_HISTORY_LIMIT", int, _REQUIRED),
+    ("conversation_context_limit", "CONVERSATION_CONTEXT_LIMIT", int, _REQUIRED),
+    ("conversation_unlimited", "CONVERSATION_UNLIMITED", _parse_bool, _REQUIRED),
+    ("conversation_summary_batch", "CONVERSATION_SUMMARY_BATCH", int, 0),
+    # 스트림 설정
+    ("enable_streaming", "ENABLE_STREAMING", _parse_bool, _REQUIRED),
+    # 메모리 설정
+    ("memory_type", "MEMORY_TYPE", str, _REQUIRED),
+    ("memory_max_messages", "MEMORY_MAX_MESSAGES", int, 5000),
+    ("redis_url", "REDIS_URL", str, None),
+    ("postgres_url", "POSTGRES_URL", str, None),
+    # 로깅 설정
+    ("log_level", "LOG_LEVEL", str, _REQUIRED),
+    ("log_file_path", "LOG_FILE_PATH", str, _REQUIRED),
+    ("log_max_file_size", "LOG_MAX_FILE_SIZE", str, _REQUIRED),
+    ("log_backup_count", "LOG_BACKUP_COUNT", int, _REQUIRED),
+    ("log_format", "LOG_FORMAT", str, _REQUIRED),
+    ("log_include_agent_conversations", "LOG_INCLUDE_AGENT_CONVERSATIONS", _parse_bool, _REQUIRED),
+    ("log_audit_file_path", "LOG_AUDIT_FILE_PATH", str, ""),
+    # 개발자 설정
+    ("dev_mode", "DEV_MODE", _parse_bool, _REQUIRED),
+    ("log_to_console", "LOG_TO_CONSOLE", _parse_bool, _REQUIRED),
+    ("enable_debug_logging", "ENABLE_DEBUG_LOGGING", _parse_bool, _REQUIRED),
+    # CORS 설정 (기본값 전체 허용)
+    ("cors_origins", "CORS_ORIGINS", str, "*"),
+)
+
+
+def _load_env(env_file: str = ".env") -> dict:
+    """.env 파일과 환경변수를 합친 값 (환경변수 우선, 이름은 대소문자 구분 없음)"""
+    values = {}
+    if os.path.isfile(env_file):
+        from dotenv import dotenv_values
+        values.update((key.upper(), value) for key, value in dotenv_values(env_file, encoding="utf-8").items() if value is not None)
+    values.update((key.upper(), value) for key, value in os.environ.items())
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     # 서버 설정
     host: str
     port: int
@@ -27,12 +106,6 @@ class Settings(BaseSettings):
     vllm_frequency_penalty: float
     vllm_presence_penalty: float
 
-    openai_api_key: Optional[str] = None
-    openai_model: Optional[str] = None
-
-    ollama_url: Optional[str] = None
-    ollama_model: Optional[str] = None
-
     # 대화 설정
     conversation_max_turns: int
     conversation_turn_interval: float
@@ -45,8 +118,6 @@ class Settings(BaseSettings):
 
     # 메모리 설정
     memory_type: str
-    redis_url: Optional[str] = None
-    postgres_url: Optional[str] = None
 
     # 로깅 설정
     log_level: str
@@ -61,54 +132,52 @@ class Settings(BaseSettings):
     log_to_console: bool
     enable_debug_logging: bool
 
+    openai_api_key: Optional[str] = None
+    openai_model: Optional[str] = None
+
+    ollama_url: Optional[str] = None
+    ollama_model: Optional[str] = None
+
+    redis_url: Optional[str] = None
+    postgres_url: Optional[str] = None
+    memory_max_messages: int = 5000  # 인메모리 저장소의 대화별 최대 보관 메시지 수
+    conversation_summary_batch: int = 0  # 컨텍스트에서 밀려난 메시지를 몇 개씩 모아 요약할지 (0 = 요약 안 함)
+
+    log_audit_file_path: str = ""  # 에이전트 발화 전문을 따로 기록할 파일 (빈 값이면 구조화 로그에 전문 포함)
+
+    cors_origins: str = "*"  # .env에서 CORS_ORIGINS로 관리, 기본값 전체 허용
+
     # 로깅 설정 객체
     logging_config: Optional[LoggingConfig] = None
 
-    cors_origins: str = "*"  # .env에서 CORS_ORIGINS로 관리, 기본값 전체 허용
+    # 파생 설정 dict 캐시 (필드가 불변이므로 최초 접근 시 한 번만 생성)
+    _llm_config: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _memory_config: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _conversation_config: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        # 환경변수명과 필드명 매핑
-        fields = {
-            "host": {"env": "HOST"},
-            "port": {"env": "PORT"},
-            "debug": {"env": "DEBUG"},
-            "llm_provider": {"env": "LLM_PROVIDER"},
-            "vllm_url": {"env": "VLLM_URL"},
-            "vllm_model": {"env": "VLLM_MODEL"},
-            "vllm_max_tokens": {"env": "VLLM_MAX_TOKENS"},
-            "vllm_temperature": {"env": "VLLM_TEMPERATURE"},
-            "vllm_top_p": {"env": "VLLM_TOP_P"},
-            "vllm_frequency_penalty": {"env": "VLLM_FREQUENCY_PENALTY"},
-            "vllm_presence_penalty": {"env": "VLLM_PRESENCE_PENALTY"},
-            "openai_api_key": {"env": "OPENAI_API_KEY"},
-            "openai_model": {"env": "OPENAI_MODEL"},
-            "ollama_url": {"env": "OLLAMA_URL"},
-            "ollama_model": {"env": "OLLAMA_MODEL"},
-            "conversation_max_turns": {"env": "CONVERSATION_MAX_TURNS"},
-            "conversation_turn_interval": {"env": "CONVERSATION_TURN_INTERVAL"},
-            "conversation_history_limit": {"env": "CONVERSATION_HISTORY_LIMIT"},
-            "conversation_context_limit": {"env": "CONVERSATION_CONTEXT_LIMIT"},
-            "conversation_unlimited": {"env": "CONVERSATION_UNLIMITED"},
-            "enable_streaming": {"env": "ENABLE_STREAMING"},
-            "memory_type": {"env": "MEMORY_TYPE"},
-            "redis_url": {"env": "REDIS_URL"},
-            "postgres_url": {"env": "POSTGRES_URL"},
-            "log_level": {"env": "LOG_LEVEL"},
-            "log_file_path": {"env": "LOG_FILE_PATH"},
-            "log_max_file_size": {"env": "LOG_MAX_FILE_SIZE"},
-            "log_backup_count": {"env": "LOG_BACKUP_COUNT"},
-            "log_format": {"env": "LOG_FORMAT"},
-            "log_include_agent_conversations": {"env": "LOG_INCLUDE_AGENT_CONVERSATIONS"},
-            "dev_mode": {"env": "DEV_MODE"},
-            "log_to_console": {"env": "LOG_TO_CONSOLE"},
-            "enable_debug_logging": {"env": "ENABLE_DEBUG_LOGGING"},
-            "cors_origins": {"env": "CORS_ORIGINS"},
-        }
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """환경변수(.env 포함)를 한 번 훑어 설정 생성"""
+        env = _load_env(env_file)
+        values = {}
+        missing = []
+        for name, env_name, convert, default in _FIELDS:
+            raw = env.get(env_name)
+            if raw is None:
+                if default is _REQUIRED:
+                    missing.append(env_name)
+                else:
+                    values[name] = default
+                continue
+            try:
+                values[name] = convert(raw)
+            except ValueError as e:
+                raise ValueError(f"환경변수 {env_name} 값이 올바르지 않습니다: {e}") from e
+        if missing:
+            raise ValueError(f"필수 환경변수가 설정되지 않았습니다: {', '.join(missing)}")
+        return cls(**values)
+
+    def __post_init__(self):
         self._setup_logging_config()
     
     def _setup_logging_config(self):
@@ -121,10 +190,42 @@ class Settings(BaseSettings):
             "format": self.log_format,
             "include_agent_conversations": self.log_include_agent_conversations
         }
-        self.logging_config = LoggingConfig(log_config_data)
+        object.__setattr__(self, "logging_config", LoggingConfig(log_config_data))
     
+    @property
+    def llm_config(self) -> dict:
+        """현재 LLM 제공자에 따른 설정 (공유 객체이므로 수정하지 말 것)"""
+        if self._llm_config is None:
+            object.__setattr__(self, "_llm_config", self._build_llm_config())
+        return self._llm_config
+
+    @property
+    def memory_config(self) -> dict:
+        """메모리 설정 (공유 객체이므로 수정하지 말 것)"""
+        if self._memory_config is None:
+            object.__setattr__(self, "_memory_config", self._build_memory_config())
+        return self._memory_config
+
+    @property
+    def conversation_config(self) -> dict:
+        """대화 설정 (공유 객체이므로 수정하지 말 것)"""
+        if self._conversation_config is None:
+            object.__setattr__(self, "_conversation_config", self._build_conversation_config())
+        return self._conversation_config
+
     def get_llm_config(self) -> dict:
         """현재 LLM 제공자에 따른 설정 반환"""
+        return self.llm_config
+    
+    def get_memory_config(self) -> dict:
+        """메모리 설정 반환"""
+        return self.memory_config
+    
+    def get_conversation_config(self) -> dict:
+        """대화 설정 반환"""
+        return self.conversation_config
+    
+    def _build_llm_config(self) -> dict:
         if self.llm_provider == "vllm":
             return {
                 "url": self.vllm_url,
@@ -148,23 +249,22 @@ class Settings(BaseSettings):
         else:
             raise ValueError(f"지원하지 않는 LLM 제공자: {self.llm_provider}")
     
-    def get_memory_config(self) -> dict:
-        """메모리 설정 반환"""
+    def _build_memory_config(self) -> dict:
         return {
             "type": self.memory_type,
             "redis_url": self.redis_url,
             "postgres_url": self.postgres_url
         }
     
-    def get_conversation_config(self) -> dict:
-        """대화 설정 반환"""
+    def _build_conversation_config(self) -> dict:
         return {
             "max_turns": self.conversation_max_turns,
             "turn_interval": self.conversation_turn_interval,
             "history_limit": self.conversation_history_limit,
             "context_limit": self.conversation_context_limit,
-            "unlimited": self.conversation_unlimited
+            "unlimited": self.conversation_unlimited,
+            "summary_batch": self.conversation_summary_batch
         }
 
 # 전역 설정 인스턴스
-settings = Settings() 
\ No newline at end of file
+settings = Settings.from_env()
\ No newline at end of file
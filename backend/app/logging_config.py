@@ -1,105 +1,207 @@
+import atexit
+import copy
 import logging
 import logging.config
+import logging.handlers
+import queue
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from app.config import settings
 from app.services.logging_service import ECSFormatter
 
+# 실제 출력(포맷, 콘솔/파일 I/O)을 담당하는 백그라운드 리스너
+_listener: Optional[logging.handlers.QueueListener] = None
+# 파일 쓰기를 모아서 처리하는 버퍼 핸들러
+_file_buffer: Optional[logging.handlers.MemoryHandler] = None
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """LogRecord를 가공하지 않고 큐에 넣는 핸들러
+
+    같은 프로세스의 리스너가 소비하므로 미리 문자열로 만들 필요가 없고,
+    exc_info를 유지해야 ECSFormatter가 error 필드를 채울 수 있다.
+    """
+
+    def prepare(self, record):
+        return record
+
+    def handle(self, record):
+        # SimpleQueue.put은 스레드 안전하므로 Handler.handle과 달리 핸들러 락 없이 바로 넣는다
+        # (여러 스레드/대화가 로그를 남겨도 생산자 쪽에서 서로를 기다리지 않음)
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+
+class _BatchFileBuffer(logging.handlers.MemoryHandler):
+    """모인 레코드를 한 번의 write로 파일에 기록하는 버퍼 핸들러
+
+    MemoryHandler.flush는 레코드마다 target.handle을 호출해 레코드 수만큼 write/flush가 일어나므로,
+    버퍼 전체를 포맷한 뒤 이어 붙여 한 번에 쓴다.
+    """
+
+    def flush(self):
+        with self.lock:
+            target = self.target
+            if not self.buffer or target is None:
+                return
+            records, self.buffer = self.buffer, []
+            lines = []
+            for record in records:
+                if record.levelno < target.level:
+                    continue
+                try:
+                    lines.append(target.format(record))
+                except Exception:
+                    target.handleError(record)
+            if not lines:
+                return
+            with target.lock:
+                try:
+                    if target.stream is None:
+                        target.stream = target._open()
+                    target.stream.write(target.terminator.join(lines) + target.terminator)
+                    target.stream.flush()
+                except Exception:
+                    target.handleError(records[-1])
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    flush_logs()
+
+
+def flush_logs():
+    """버퍼에 쌓인 파일 로그를 즉시 기록"""
+    if _file_buffer is not None:
+        _file_buffer.flush()
+
+
+atexit.register(_stop_listener)
+
+# 설정은 불변이므로 로그 포맷과 포맷터는 import 시 한 번만 결정
+_LOG_FORMAT = getattr(settings, 'log_format', 'ecs')
+
+if _LOG_FORMAT == 'stdout':
+    # 원래 터미널 출력용 포맷터
+    _FORMATTER = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+else:
+    # ECS 포맷터 (기본값)
+    _FORMATTER = ECSFormatter()
+
+
+# 큐 핸들러를 붙이는 로거들 (최초 설정 시 한 번만 조회)
+_CONFIGURED = False
+_LOGGERS: Tuple[logging.Logger, ...] = ()
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+# 레벨만 낮춰 불필요한 로그를 억제할 로거들
+_QUIET_LOGGERS = (
+    "uvicorn.protocols.http.httptools_impl",
+    "uvicorn.protocols.websockets.websockets_impl",
+    "uvicorn.lifespan.on",
+)
+
+
 def setup_logging():
-    """로깅 설정 - 포맷에 따라 다르게 적용"""
-    
-    # 로그 포맷 확인
-    log_format = getattr(settings, 'log_format', 'ecs')
-    
-    # 포맷터 선택
-    if log_format == 'stdout':
-        # 원래 터미널 출력용 포맷터
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+    """로깅 설정 - 포맷에 따라 다르게 적용
+
+    여러 번 호출돼도 핸들러/리스너는 한 번만 만들고, 이후에는 uvicorn의 dictConfig 등으로
+    큐 핸들러가 빠진 경우에만 다시 연결한다.
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        if all(_queue_handler in logger.handlers for logger in _LOGGERS):
+            return
     else:
-        # ECS 포맷터 (기본값)
-        formatter = ECSFormatter()
-    
-    # uvicorn 로거 설정
-    uvicorn_logger = logging.getLogger("uvicorn")
-    uvicorn_logger.handlers.clear()
-    
-    # uvicorn access 로거 설정
-    uvicorn_access_logger = logging.getLogger("uvicorn.access")
-    uvicorn_access_logger.handlers.clear()
-    
-    # uvicorn error 로거 설정
-    uvicorn_error_logger = logging.getLogger("uvicorn.error")
-    uvicorn_error_logger.handlers.clear()
-    
-    # FastAPI 로거 설정
-    fastapi_logger = logging.getLogger("fastapi")
-    fastapi_logger.handlers.clear()
-    
-    # 루트 로거 설정
-    root_logger = logging.getLogger()
-    root_logger.handlers.clear()
+        _configure_handlers()
+        _CONFIGURED = True
+    _attach_handlers()
+
+
+def _configure_handlers():
+    """출력 핸들러, 큐 리스너, 대상 로거 생성"""
+    global _listener, _file_buffer, _queue_handler, _LOGGERS
+    formatter = _FORMATTER
     
     # 콘솔 핸들러 생성
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
+    output_handlers = [console_handler]
     
     # 파일 핸들러 생성 (선택적)
+    _file_buffer = None
     if settings.log_file_path:
         file_handler = logging.FileHandler(settings.log_file_path)
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.INFO)
+        # 파일은 레코드마다 write 하지 않고 모아서 한 번에 기록 (ERROR 이상은 즉시 flush)
+        _file_buffer = _BatchFileBuffer(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        _file_buffer.setLevel(logging.INFO)
+        output_handlers.append(_file_buffer)
     
-    # 로거들에 핸들러 추가
-    loggers_to_configure = [
-        uvicorn_logger,
-        uvicorn_access_logger,
-        uvicorn_error_logger,
-        fastapi_logger,
-        root_logger
-    ]
+    # 이벤트 루프 스레드에서는 큐에 넣기만 하고, 포맷과 I/O는 리스너 스레드에서 처리
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _RecordQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    _listener.start()
     
-    for logger in loggers_to_configure:
+    # uvicorn, uvicorn.error, FastAPI, 루트 로거
+    _LOGGERS = (
+        logging.getLogger("uvicorn"),
+        logging.getLogger("uvicorn.error"),
+        logging.getLogger("fastapi"),
+        logging.getLogger(),
+    )
+    
+    # 불필요한 로그 억제
+    for name in _QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def _attach_handlers():
+    """대상 로거에 큐 핸들러 연결"""
+    for logger in _LOGGERS:
         logger.handlers.clear()
-        logger.addHandler(console_handler)
-        if settings.log_file_path:
-            logger.addHandler(file_handler)
+        logger.addHandler(_queue_handler)
         logger.setLevel(logging.INFO)
         logger.propagate = False
     
     # 특정 로거들의 레벨 조정
-    uvicorn_access_logger.setLevel(logging.INFO)
-    uvicorn_error_logger.setLevel(logging.ERROR)
+    logging.getLogger("uvicorn.error").setLevel(logging.ERROR)
     
-    # 불필요한 로그 억제
-    logging.getLogger("uvicorn.protocols.http.httptools_impl").setLevel(logging.WARNING)
-    logging.getLogger("uvicorn.protocols.websockets.websockets_impl").setLevel(logging.WARNING)
-    logging.getLogger("uvicorn.lifespan.on").setLevel(logging.WARNING)
+    # uvicorn access 로거 설정 (요청 단위 access 로그는 사용하지 않음)
+    uvicorn_access_logger = logging.getLogger("uvicorn.access")
+    uvicorn_access_logger.handlers.clear()
+    uvicorn_access_logger.setLevel(logging.WARNING)
+    uvicorn_access_logger.propagate = False
 
-def get_uvicorn_log_config() -> Dict[str, Any]:
-    """uvicorn용 로깅 설정 반환"""
-    # 로그 포맷 확인
-    log_format = getattr(settings, 'log_format', 'ecs')
-    
-    # 포맷터 설정
-    if log_format == 'stdout':
-        formatters = {
-            "stdout": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S"
-            }
-        }
-        formatter_name = "stdout"
-    else:
-        formatters = {
-            "ecs": {
-                "()": "app.services.logging_service.ECSFormatter",
-            }
+def _shared_formatter() -> logging.Formatter:
+    """uvicorn dictConfig용 팩토리 - 새로 만들지 않고 모듈 포맷터를 재사용"""
+    return _FORMATTER
+
+
+def _build_uvicorn_log_config() -> Dict[str, Any]:
+    # 포맷터 설정 (설정이 적용될 때마다 포맷터를 새로 만들지 않도록 공유 인스턴스 사용)
+    formatter_name = "stdout" if _LOG_FORMAT == 'stdout' else "ecs"
+    formatters = {
+        formatter_name: {
+            "()": _shared_formatter,
         }
-        formatter_name = "ecs"
+    }
     
     return {
         "version": 1,
@@ -119,8 +221,8 @@ def get_uvicorn_log_config() -> Dict[str, Any]:
                 "propagate": False
             },
             "uvicorn.access": {
-                "handlers": ["console"],
-                "level": "INFO",
+                "handlers": [],
+                "level": "WARNING",
                 "propagate": False
             },
             "uvicorn.error": {
@@ -138,4 +240,15 @@ def get_uvicorn_log_config() -> Dict[str, Any]:
             "handlers": ["console"],
             "level": "INFO"
         }
-    } 
\ No newline at end of file
+    }
+
+
+_UVICORN_CONFIG = _build_uvicorn_log_config()
+
+
+def get_uvicorn_log_config() -> Dict[str, Any]:
+    """uvicorn용 로깅 설정 반환
+
+    dictConfig가 전달받은 dict를 수정("()" 키 제거 등)하므로 미리 만든 설정의 사본을 반환한다.
+    """
+    return copy.deepcopy(_UVICORN_CONFIG)
@@ -1,50 +1,19 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+import sys
 import uvicorn
 
-from .api.routes import router
+from .api.routes import router, start_clock, stop_clock
 from .config import settings
-from .logging_config import setup_logging
+from .logging_config import setup_logging, flush_logs
 
 
-# FastAPI 앱 생성
-app = FastAPI(
-    title="AI Agent NPC 대화 시스템",
-    description="vLLM 기반 AI 에이전트들의 자유로운 대화 시스템",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# CORS 설정
-origins = (
-    ["*"] if settings.cors_origins == "*"
-    else [o.strip() for o in settings.cors_origins.split(",") if o.strip()]
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# API 라우터 등록
-app.include_router(router, prefix="/api")
-
-# 정적 파일 서빙 (프론트엔드용)
-try:
-    app.mount("/", StaticFiles(directory="../frontend/dist", html=True), name="static")
-except:
-    # 프론트엔드 빌드 파일이 없는 경우 무시
-    pass
-
-
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 실행"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 실행"""
     # ECS 로깅 설정 적용
     setup_logging()
     
@@ -59,6 +28,7 @@ async def startup_event():
         llm_provider=settings.llm_provider,
         memory_type=settings.memory_type
     )
+    await start_clock()
     
     # 터미널 출력 (개발 환경용)
     if settings.debug or settings.log_to_console:
@@ -67,22 +37,63 @@ async def startup_event():
         print(f"💾 메모리 타입: {settings.memory_type}")
         print(f"🌐 서버 주소: http://{settings.host}:{settings.port}")
         print(f"📚 API 문서: http://{settings.host}:{settings.port}/docs")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서버 종료 시 실행"""
-    from .services.logging_service import get_logging_service
-    logging_service = get_logging_service()
+    
+    yield
+    
+    await stop_clock()
+    
+    # 백그라운드로 예약된 대화 저장 마무리
+    from .services.conversation_service import conversation_service
+    await conversation_service.flush_pending_saves()
     
     # 서버 종료 로깅
     logging_service.log_server_shutdown()
     
+    # 버퍼에 남은 파일 로그 기록
+    flush_logs()
+    
     # 터미널 출력 (개발 환경용)
     if settings.debug or settings.log_to_console:
         print("🛑 AI Agent NPC 대화 시스템이 종료되었습니다.")
 
 
+# FastAPI 앱 생성
+app = FastAPI(
+    title="AI Agent NPC 대화 시스템",
+    description="vLLM 기반 AI 에이전트들의 자유로운 대화 시스템",
+    version="1.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# CORS 설정 (허용 출처는 import 시 한 번만 계산)
+CORS_ORIGINS = tuple(o.strip() for o in settings.cors_origins.split(",") if o.strip())
+CORS_ALLOW_ALL = CORS_ORIGINS == ("*",)
+
+# CORS_ORIGINS를 비워 두면 미들웨어 자체를 붙이지 않음 (같은 출처 프록시 뒤에서 실행하는 경우)
+if CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        # 와일드카드는 자격 증명과 함께 쓸 수 없으므로 끄고, 응답 헤더를 고정값으로 유지
+        allow_credentials=not CORS_ALLOW_ALL,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# API 라우터 등록
+app.include_router(router, prefix="/api")
+
+# 정적 파일 서빙 (프론트엔드용)
+try:
+    app.mount("/", StaticFiles(directory="../frontend/dist", html=True), name="static")
+except:
+    # 프론트엔드 빌드 파일이 없는 경우 무시
+    pass
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -101,5 +112,10 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
-        log_level="info"
+        log_level="warning",
+        # 요청마다 찍히는 access 로그와 프록시 헤더 처리 비활성화
+        access_log=False,
+        proxy_headers=False,
+        # Cython 구현 이벤트 루프 사용 (uvloop는 Windows 미지원)
+        loop="asyncio" if sys.platform == "win32" else "uvloop"
     ) 
\ No newline at end of file
@@ -1,9 +1,9 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from enum import StrEnum
 
 
-class AgentPersonality(str, Enum):
+class AgentPersonality(StrEnum):
     PHILOSOPHER = "philosopher"
     SCIENTIST = "scientist"
     ARTIST = "artist"
@@ -22,11 +22,13 @@ class Agent(BaseModel):
     avatar_url: Optional[str] = None
     is_active: bool = True
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class AgentMessage(BaseModel):
+    # 생성 후 수정하지 않는 값 객체
+    model_config = ConfigDict(frozen=True)
+    
     agent_id: str
     content: str
     timestamp: float
@@ -1,11 +1,12 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
-from enum import Enum
+import time
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field, field_validator
+from enum import StrEnum
 from datetime import datetime
 from .agent import AgentMessage, AgentState
 
 
-class ConversationStatus(str, Enum):
+class ConversationStatus(StrEnum):
     IDLE = "idle"
     ACTIVE = "active"
     STOPPED = "stopped"
@@ -15,12 +16,38 @@ class ConversationStatus(str, Enum):
 
 class Message(BaseModel):
     """대화 메시지 모델"""
+    # 생성 후 수정하지 않는 값 객체
+    model_config = ConfigDict(frozen=True)
+    
     speaker: str
     content: str
     agent_id: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: float = Field(default_factory=time.time)  # Unix timestamp
     turn_number: Optional[int] = None
     is_streaming: Optional[bool] = False
+    
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def _coerce_timestamp(cls, value: Any) -> Any:
+        """이전 형식(datetime/ISO 문자열)으로 저장된 대화도 읽을 수 있도록 변환"""
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return value
+    
+    @computed_field
+    @property
+    def timestamp_iso(self) -> str:
+        """직렬화 시에만 만드는 ISO-8601 시각"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+
+class StreamingMessage(Message):
+    """스트리밍 중인 메시지 - 턴마다 한 번 만들고 content만 갱신 (대입 시 검증하지 않음)"""
+    model_config = ConfigDict(frozen=False)
+    
+    is_streaming: Optional[bool] = True
 
 
 class Conversation(BaseModel):
@@ -42,8 +69,17 @@ class Conversation(BaseModel):
     agent_states: Dict[str, AgentState] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    class Config:
-        use_enum_values = True
+    # 컨텍스트 창에서 밀려난 메시지들의 누적 요약과, 요약에 반영된 앞쪽 메시지 수
+    context_summary: str = ""
+    summarized_count: int = 0
+    
+    # 턴마다 바뀌지 않는 시스템 프롬프트 틀 (서비스가 최초 사용 시 생성, 직렬화 제외)
+    _prompt_template: Optional[str] = PrivateAttr(default=None)
+    # 발화 순서대로 정렬된 참여 에이전트 (서비스가 생성 시 채움, 직렬화 제외)
+    _turn_agents: Optional[tuple] = PrivateAttr(default=None)
+    
+    # 메시지 추가/상태 변경이 있으므로 frozen 미적용
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class ConversationRequest(BaseModel):
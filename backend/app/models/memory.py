@@ -1,19 +1,32 @@
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Set
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 from datetime import datetime
 from abc import ABC, abstractmethod
-import asyncio
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from itertools import islice
 from .agent import AgentMessage, AgentState
 from .conversation import Conversation
 
 
 class MemoryEntry(BaseModel):
+    # 저장된 메시지마다 생성되며 이후 수정하지 않음
+    model_config = ConfigDict(frozen=True)
+    
     conversation_id: str
     agent_id: str
     message: AgentMessage
     context: Dict[str, Any] = Field(default_factory=dict)
     importance_score: float = Field(ge=0.0, le=1.0, default=0.5)
-    created_at: datetime
+    created_at: float = Field(default_factory=time.time)  # Unix timestamp
+    
+    @computed_field
+    @property
+    def created_at_iso(self) -> str:
+        """직렬화 시에만 만드는 ISO-8601 시각"""
+        return datetime.fromtimestamp(self.created_at).isoformat()
 
 
 class MemoryInterface(ABC):
@@ -48,58 +61,134 @@ class MemoryInterface(ABC):
 class InMemoryStorage(MemoryInterface):
     """인메모리 메모리 저장소"""
     
-    def __init__(self):
-        self.memories: Dict[str, List[MemoryEntry]] = {}
-        self.lock = asyncio.Lock()
+    def __init__(self, max_messages: Optional[int] = None):
+        if max_messages is None:
+            from ..config import settings
+            max_messages = settings.memory_max_messages
+        # 대화별 최대 보관 메시지 수 - 초과 시 가장 오래된 메시지부터 버림
+        self.max_messages = max_messages
+        self.memories: Dict[str, deque] = {}
+        # 대화별 역색인: 소문자 토큰 -> 해당 토큰이 포함된 메시지의 누적 순번
+        self.token_index: Dict[str, Dict[str, Set[int]]] = {}
+        # 대화별로 deque 맨 앞 메시지의 누적 순번 (버려진 메시지 수)
+        self.offsets: Dict[str, int] = {}
+        # 대화별 락 - 서로 다른 대화의 저장/조회가 서로를 기다리지 않도록 분리
+        # 작업 중 await가 없으므로 스레드 락으로 충분하며, 동기 메서드를 워커 스레드에서 호출해도 안전하다.
+        # (팩토리가 C 구현이라 defaultdict 삽입은 GIL 아래에서 원자적)
+        # 락은 저장 시에만 만들고 조회는 get으로 확인하며, 대화 메모리 삭제 시 함께 제거한다.
+        self.locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
     
+    # MemoryInterface 구현 - 실제 작업은 CPU만 쓰는 짧은 동기 코드이므로 스레드로 넘기지 않고 바로 실행
+    # (*_sync 메서드는 인메모리 저장소에만 있는 동기 경로이며, 인터페이스 계약은 async 메서드)
     async def store_message(self, conversation_id: str, agent_id: str, message: AgentMessage, context: Dict[str, Any] = None) -> None:
-        async with self.lock:
+        self.store_message_sync(conversation_id, agent_id, message, context)
+    
+    async def get_conversation_history(self, conversation_id: str, limit: int = 50) -> List[MemoryEntry]:
+        return self.get_conversation_history_sync(conversation_id, limit)
+    
+    async def get_agent_memory(self, agent_id: str, conversation_id: str, limit: int = 20) -> List[MemoryEntry]:
+        return self.get_agent_memory_sync(agent_id, conversation_id, limit)
+    
+    async def get_relevant_context(self, conversation_id: str, current_topic: str, limit: int = 10) -> List[MemoryEntry]:
+        return self.get_relevant_context_sync(conversation_id, current_topic, limit)
+    
+    async def clear_conversation_memory(self, conversation_id: str) -> None:
+        self.clear_conversation_memory_sync(conversation_id)
+    
+    def store_message_sync(self, conversation_id: str, agent_id: str, message: AgentMessage, context: Dict[str, Any] = None) -> None:
+        # ID는 종류가 적고 메시지마다 반복되므로 intern하여 항목들이 같은 문자열 객체를 공유하도록 함
+        conversation_id = sys.intern(conversation_id)
+        agent_id = sys.intern(agent_id)
+        with self.locks[conversation_id]:
             if conversation_id not in self.memories:
-                self.memories[conversation_id] = []
+                self.memories[conversation_id] = deque(maxlen=self.max_messages)
+                self.offsets[conversation_id] = 0
+            
+            entries = self.memories[conversation_id]
+            index = self.token_index.setdefault(conversation_id, {})
+            if len(entries) == entries.maxlen:
+                # 밀려날 가장 오래된 메시지를 역색인에서도 제거
+                self._unindex(index, entries[0], self.offsets[conversation_id])
+                self.offsets[conversation_id] += 1
             
             entry = MemoryEntry(
                 conversation_id=conversation_id,
                 agent_id=agent_id,
                 message=message,
-                context=context or {},
-                created_at=datetime.now()
+                context=context or {}
             )
-            self.memories[conversation_id].append(entry)
+            entries.append(entry)
+            
+            # 저장 시 한 번만 토큰화하여 역색인에 등록
+            position = self.offsets[conversation_id] + len(entries) - 1
+            for token in set(message.content.lower().split()):
+                index.setdefault(token, set()).add(position)
     
-    async def get_conversation_history(self, conversation_id: str, limit: int = 50) -> List[MemoryEntry]:
-        async with self.lock:
+    def get_conversation_history_sync(self, conversation_id: str, limit: int = 50) -> List[MemoryEntry]:
+        lock = self.locks.get(conversation_id)
+        if lock is None:
+            return []
+        with lock:
             if conversation_id not in self.memories:
                 return []
-            return self.memories[conversation_id][-limit:]
+            entries = self.memories[conversation_id]
+            return list(islice(entries, max(0, len(entries) - limit), None))
     
-    async def get_agent_memory(self, agent_id: str, conversation_id: str, limit: int = 20) -> List[MemoryEntry]:
-        async with self.lock:
+    def get_agent_memory_sync(self, agent_id: str, conversation_id: str, limit: int = 20) -> List[MemoryEntry]:
+        lock = self.locks.get(conversation_id)
+        if lock is None:
+            return []
+        with lock:
             if conversation_id not in self.memories:
                 return []
             
-            agent_memories = [
-                entry for entry in self.memories[conversation_id]
-                if entry.agent_id == agent_id
-            ]
-            return agent_memories[-limit:]
+            # 최신 메시지부터 역순으로 훑어 limit개를 채우면 중단
+            # (저장된 ID와 같은 객체가 되도록 intern하여 비교가 동일성 검사에서 끝나게 함)
+            agent_id = sys.intern(agent_id)
+            recent = (entry for entry in reversed(self.memories[conversation_id]) if entry.agent_id == agent_id)
+            agent_memories = list(islice(recent, limit))
+            agent_memories.reverse()
+            return agent_memories
     
-    async def get_relevant_context(self, conversation_id: str, current_topic: str, limit: int = 10) -> List[MemoryEntry]:
-        async with self.lock:
+    def get_relevant_context_sync(self, conversation_id: str, current_topic: str, limit: int = 10) -> List[MemoryEntry]:
+        lock = self.locks.get(conversation_id)
+        if lock is None:
+            return []
+        with lock:
             if conversation_id not in self.memories:
                 return []
             
-            # 간단한 키워드 기반 관련성 검색
-            relevant_entries = []
-            topic_keywords = current_topic.lower().split()
-            
-            for entry in self.memories[conversation_id]:
-                content_lower = entry.message.content.lower()
-                if any(keyword in content_lower for keyword in topic_keywords):
-                    relevant_entries.append(entry)
+            # 간단한 키워드 기반 관련성 검색 (역색인 조회)
+            # 키워드에는 공백이 없으므로 본문 부분 문자열 일치는 항상 토큰 하나 안에서 일어난다.
+            # 따라서 메시지 전체 대신 토큰 목록만 훑어도 결과가 같다.
+            index = self.token_index.get(conversation_id, {})
+            matched: Set[int] = set()
+            for keyword in set(current_topic.lower().split()):
+                for token, positions in index.items():
+                    if keyword in token:
+                        matched |= positions
             
-            return relevant_entries[-limit:]
+            entries = self.memories[conversation_id]
+            offset = self.offsets[conversation_id]
+            return [entries[position - offset] for position in sorted(matched)[-limit:]]
     
-    async def clear_conversation_memory(self, conversation_id: str) -> None:
-        async with self.lock:
-            if conversation_id in self.memories:
-                del self.memories[conversation_id] 
\ No newline at end of file
+    def clear_conversation_memory_sync(self, conversation_id: str) -> None:
+        lock = self.locks.get(conversation_id)
+        if lock is None:
+            return
+        with lock:
+            self.memories.pop(conversation_id, None)
+            self.token_index.pop(conversation_id, None)
+            self.offsets.pop(conversation_id, None)
+            self.locks.pop(conversation_id, None)
+    
+    @staticmethod
+    def _unindex(index: Dict[str, Set[int]], entry: MemoryEntry, position: int) -> None:
+        """버려지는 메시지의 순번을 역색인에서 제거"""
+        for token in set(entry.message.content.lower().split()):
+            positions = index.get(token)
+            if positions is None:
+                continue
+            positions.discard(position)
+            if not positions:
+                del index[token] 
\ No newline at end of file
@@ -1,20 +1,25 @@
 # 서비스 모듈 초기화
 # 순환 import 문제를 방지하기 위해 지연 로딩 사용
+# 각 getter는 모듈 전역 인스턴스를 반환하고, 결과는 functools.cache로 고정 (싱글톤)
+from functools import cache
 
+@cache
 def get_conversation_service():
     """대화 서비스 인스턴스 반환"""
-    from .conversation_service import ConversationService
-    return ConversationService()
+    from .conversation_service import conversation_service
+    return conversation_service
 
+@cache
 def get_llm_service():
     """LLM 서비스 인스턴스 반환"""
-    from .llm_service import LLMService
-    return LLMService()
+    from .llm_service import llm_service
+    return llm_service
 
+@cache
 def get_memory_service():
     """메모리 서비스 인스턴스 반환"""
-    from .memory_service import MemoryService
-    return MemoryService()
+    from .memory_service import get_memory_service as _get_memory_service
+    return _get_memory_service()
 
 # 로깅 서비스는 logging_service.py에서 직접 import
 
@@ -22,4 +27,4 @@ __all__ = [
     'get_conversation_service',
     'get_llm_service',
     'get_memory_service'
-] 
\ No newline at end of file
+]
@@ -1,9 +1,11 @@
 import asyncio
-import json
 import logging
-from typing import List, Dict, Any, Optional, Callable
+import os
+import orjson
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from datetime import datetime
-from app.models.conversation import Conversation, Message, ConversationRequest
+from app.models.conversation import Conversation, Message, StreamingMessage, ConversationRequest
 from app.models.agent import Agent
 from app.services.llm_service import LLMService
 from app.services.memory_service import get_memory_service
@@ -11,6 +13,17 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# 에이전트 정의 파일 경로
+AGENTS_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'agents.json')
+
+# 컨텍스트에서 밀려난 대화를 누적 요약할 때 사용하는 프롬프트
+SUMMARY_PROMPT = """다음은 주제 "{topic}"에 대한 대화의 이전 요약과, 그 이후 이어진 대화 내용입니다.
+
+이전 요약:
+{previous_summary}
+
+이전 요약의 내용을 유지하면서 이어진 대화를 반영해, 지금까지의 핵심 논점과 각 참여자의 입장을 5문장 이내로 요약하세요. 요약문만 출력하세요."""
+
 class ConversationService:
     """대화 서비스 클래스"""
     
@@ -18,12 +31,28 @@ class ConversationService:
         self.llm_service = LLMService()
         self.memory_service = get_memory_service()
         self.active_conversations: Dict[str, Conversation] = {}
-        self.conversation_callbacks: Dict[str, List[Callable]] = {}
-        self.message_callbacks: List[Callable] = []
+        # 콜백은 (콜백, 코루틴 함수 여부) 튜플로 보관 - 등록 시 새 튜플로 교체하고 실행 시에는 그대로 순회
+        self.conversation_callbacks: Dict[str, Tuple[Tuple[Callable, bool], ...]] = {}
+        self.message_callbacks: Tuple[Tuple[Callable, bool], ...] = ()
+        # 대화별 새 메시지 알림 이벤트 (모니터가 폴링 대신 대기)
+        self._message_events: Dict[str, asyncio.Event] = {}
+        # 대화별 중지 이벤트 (턴 간격 대기 중에도 종료를 즉시 반영)
+        self._stop_events: Dict[str, asyncio.Event] = {}
+        # 에이전트 스냅샷 (agents.json 수정 시각 기준으로 갱신, 갱신마다 버전 증가)
+        self._agents_version = 0
+        self._agents_mtime: Optional[int] = None
+        self._agents_cache: Tuple[Agent, ...] = ()
+        self._agent_index: Dict[str, Agent] = {}
+        # 대화별로 진행 중인 백그라운드 저장 (같은 대화의 저장은 순서대로 실행)
+        self._pending_saves: Dict[str, asyncio.Task] = {}
+        # 대화별 진행 중인 백그라운드 요약 (요약은 턴 진행을 막지 않고 순서대로 실행)
+        self._pending_summaries: Dict[str, asyncio.Task] = {}
     
     def add_message_callback(self, callback: Callable):
-        """메시지 콜백 함수 등록"""
-        self.message_callbacks.append(callback)
+        """메시지 콜백 함수 등록 (같은 콜백은 한 번만 등록)"""
+        if any(registered == callback for registered, _ in self.message_callbacks):
+            return
+        self.message_callbacks += ((callback, asyncio.iscoroutinefunction(callback)),)
         logger.info("메시지 콜백 함수가 등록되었습니다.")
     
     async def create_conversation(
@@ -33,8 +62,7 @@ class ConversationService:
         """새 대화 생성"""
         try:
             # 에이전트 정보 로드
-            all_agents = self.get_agents()
-            agent_map = {agent.id: agent for agent in all_agents}
+            _, agent_map = self.get_agents_snapshot()
             
             # 요청된 에이전트들 필터링
             selected_agents = []
@@ -47,8 +75,9 @@ class ConversationService:
             if not selected_agents:
                 raise ValueError("유효한 에이전트가 없습니다.")
             
-            # 대화 ID 생성
-            conversation_id = f"conv_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(self.active_conversations)}"
+            # 대화 ID 생성 (현재 시각은 한 번만 읽어 ID와 생성/수정 시각에 함께 사용)
+            now = datetime.now()
+            conversation_id = f"conv_{now.strftime('%Y%m%d_%H%M%S')}_{len(self.active_conversations)}"
             
             # 무제한 대화 설정 확인
             max_turns = request.max_turns
@@ -63,13 +92,16 @@ class ConversationService:
                 max_turns=max_turns,
                 current_turn=0,
                 status="idle",
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
+                created_at=now,
+                updated_at=now,
                 messages=[],
                 agents=[],
                 agent_states={}
             )
             
+            # 발화 순서 (라운드 로빈) 고정
+            conversation._turn_agents = tuple(selected_agents)
+            
             # 활성 대화에 추가
             self.active_conversations[conversation_id] = conversation
             
@@ -97,29 +129,28 @@ class ConversationService:
             
             # 콜백 등록
             if callback:
-                if conversation_id not in self.conversation_callbacks:
-                    self.conversation_callbacks[conversation_id] = []
-                self.conversation_callbacks[conversation_id].append(callback)
+                self.conversation_callbacks[conversation_id] = self.conversation_callbacks.get(conversation_id, ()) + (
+                    (callback, asyncio.iscoroutinefunction(callback)),
+                )
             
             # 시스템 프롬프트 생성
             system_prompt = self._create_system_prompt(conversation)
             
-            # 대화 시작 메시지 추가
-            start_message = Message(
+            # 대화 시작 메시지 추가 (서버가 만드는 값이므로 검증 생략)
+            start_message = Message.model_construct(
                 speaker="시스템",
                 content=f"대화가 시작되었습니다. 주제: {conversation.topic}",
-                timestamp=datetime.now(),
                 turn_number=0
             )
-            conversation.messages.append(start_message)
+            self._record_message(conversation, start_message, persist=False)
             
-            # 대화 상태 변경
+            # 대화 상태 변경 (이전 실행의 중지 신호는 새 이벤트로 초기화)
+            # 첫 대기 전에 들어온 중지/종료도 설정할 이벤트가 있도록 미리 만들어 둠
             conversation.status = "active"
+            self._stop_events[conversation_id] = asyncio.Event()
             
             # 첫 번째 에이전트가 발화
-            all_agents = self.get_agents()
-            agent_map = {agent.id: agent for agent in all_agents}
-            current_agent = agent_map[conversation.agent_ids[0]]
+            current_agent = self._turn_agents_for(conversation)[0]
             await self._agent_speak(conversation, current_agent, system_prompt)
             
             # 자동으로 대화 계속 진행을 별도 태스크로 실행
@@ -157,24 +188,30 @@ class ConversationService:
                 next_agent = self._select_next_agent(conversation)
                 await self._agent_speak(conversation, next_agent, system_prompt)
                 
-                # 대화 간격 설정
-                await asyncio.sleep(settings.conversation_turn_interval)
+                # 대화 간격 설정 (그 사이 중지/종료되면 바로 빠져나감)
+                if await self.wait_turn_interval(conversation_id):
+                    break
                 
         except Exception as e:
             logger.error(f"자동 대화 진행 오류: {str(e)}")
             await self.end_conversation(conversation_id)
     
-    async def continue_conversation(self, conversation_id: str) -> bool:
-        """대화 계속"""
+    async def continue_conversation(self, conversation_id: str) -> Tuple[bool, str]:
+        """대화 계속 - (성공 여부, 진행 후 대화 상태) 반환"""
+        conversation = None
         try:
             conversation = self.active_conversations.get(conversation_id)
             if not conversation:
                 raise ValueError(f"대화를 찾을 수 없습니다: {conversation_id}")
             
+            # 이미 중지/종료된 대화는 진행하지 않음
+            if conversation.status in ("stopped", "ended"):
+                return False, conversation.status
+            
             # 대화 종료 조건 확인
             if self._should_end_conversation(conversation):
                 await self.end_conversation(conversation_id)
-                return False
+                return False, conversation.status
             
             # 시스템 프롬프트 생성
             system_prompt = self._create_system_prompt(conversation)
@@ -183,11 +220,11 @@ class ConversationService:
             next_agent = self._select_next_agent(conversation)
             await self._agent_speak(conversation, next_agent, system_prompt)
             
-            return True
+            return True, conversation.status
             
         except Exception as e:
             logger.error(f"대화 계속 오류: {str(e)}")
-            return False
+            return False, conversation.status if conversation else "error"
     
     async def stop_conversation(self, conversation_id: str) -> bool:
         """대화 중지"""
@@ -198,18 +235,15 @@ class ConversationService:
             
             # 대화 상태 변경
             conversation.status = "stopped"
+            self._signal_stop(conversation_id)
             
-            # 중지 메시지 추가
-            stop_message = Message(
+            # 중지 메시지 추가 (서버가 만드는 값이므로 검증 생략)
+            stop_message = Message.model_construct(
                 speaker="시스템",
                 content="대화가 중지되었습니다.",
-                timestamp=datetime.now(),
                 turn_number=conversation.current_turn + 1
             )
-            conversation.messages.append(stop_message)
-            
-            # 메모리에 저장
-            await self.memory_service.save_conversation(conversation)
+            self._record_message(conversation, stop_message)
             
             logger.info(f"대화 중지됨: {conversation_id}")
             return True
@@ -227,19 +261,18 @@ class ConversationService:
             
             # 대화 상태 변경
             conversation.status = "ended"
-            conversation.ended_at = datetime.now()
+            self._signal_stop(conversation_id)
+            now = time.time()
+            conversation.ended_at = datetime.fromtimestamp(now)
             
-            # 종료 메시지 추가
-            end_message = Message(
+            # 종료 메시지 추가 (종료 시각과 같은 시각, 서버가 만드는 값이므로 검증 생략)
+            end_message = Message.model_construct(
                 speaker="시스템",
                 content="대화가 종료되었습니다.",
-                timestamp=datetime.now(),
+                timestamp=now,
                 turn_number=conversation.current_turn + 1
             )
-            conversation.messages.append(end_message)
-            
-            # 메모리에 저장
-            await self.memory_service.save_conversation(conversation)
+            self._record_message(conversation, end_message)
             
             # 대화를 삭제하지 않고 유지 (사용자가 조회할 수 있도록)
             # del self.active_conversations[conversation_id]  # 이 줄 제거
@@ -270,34 +303,36 @@ class ConversationService:
             if agent.system_area:
                 system_area = agent.system_area.format(max_turns=max_turns, unlimited_message=unlimited_message)
             # 에이전트별 시스템 프롬프트 동적 생성
+            # 기본 프롬프트와 이어 붙이지 않고 그대로 넘김 (LLM 서비스가 메시지를 만들 때 한 번에 결합)
             agent_system_prompt = agent.system_prompt.format(system_area=system_area)
-            agent_system_prompt = f"{system_prompt}\n\n{agent_system_prompt}"
             
-            # 디버깅을 위한 로깅
-            logger.info(f"에이전트 {agent.name} 발화 시작")
-            logger.info(f"기본 시스템 프롬프트: {system_prompt}")
-            logger.info(f"에이전트 시스템 프롬프트: {agent.system_prompt}")
-            logger.info(f"최종 시스템 프롬프트: {agent_system_prompt}")
+            logger.info("에이전트 %s 발화 시작", agent.name)
             
             # 대화 컨텍스트 생성
             context_messages = self._create_context_messages(conversation)
-            logger.info(f"컨텍스트 메시지 수: {len(context_messages)}")
-            for i, msg in enumerate(context_messages[-3:]):  # 최근 3개 메시지만 로깅
-                logger.info(f"컨텍스트 메시지 {i}: {msg.speaker}: {msg.content}")
+            
+            # 디버깅을 위한 로깅 (DEBUG 레벨이 꺼져 있으면 문자열을 만들지 않음)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("기본 시스템 프롬프트: %s", system_prompt)
+                logger.debug("에이전트 시스템 프롬프트: %s", agent_system_prompt)
+                logger.debug("컨텍스트 메시지 수: %d", len(context_messages))
+                for i, msg in enumerate(context_messages[-3:]):  # 최근 3개 메시지만 로깅
+                    logger.debug("컨텍스트 메시지 %d: %s: %s", i, msg.speaker, msg.content)
             
             # 스트림 설정 확인
             if settings.enable_streaming:
+                # 스트림 메시지는 한 번만 만들고 콜백마다 내용만 바꿔 재사용
+                # (콜백은 호출 즉시 메시지를 직렬화하므로 이후 변경의 영향을 받지 않음)
+                stream_message = StreamingMessage.model_construct(
+                    speaker=agent.name,
+                    content="",
+                    agent_id=agent.id,
+                    turn_number=conversation.current_turn + 1
+                )
+                
                 # 스트림 콜백 함수 정의
                 async def stream_callback(chunk: str, full_content: str):
-                    # 스트림 메시지 생성 (임시)
-                    stream_message = Message(
-                        speaker=agent.name,
-                        content=full_content,
-                        agent_id=agent.id,
-                        timestamp=datetime.now(),
-                        turn_number=conversation.current_turn + 1,
-                        is_streaming=True
-                    )
+                    stream_message.content = full_content
                     
                     # WebSocket으로 스트림 업데이트 전송
                     await self._execute_callbacks(conversation.id, stream_message, is_stream=True)
@@ -305,49 +340,46 @@ class ConversationService:
                 # LLM 스트림 응답 생성
                 response = await self.llm_service.generate_response_stream(
                     messages=context_messages,
-                    system_prompt=agent_system_prompt,
+                    system_prompt=(system_prompt, agent_system_prompt),
                     stream_callback=stream_callback
                 )
             else:
                 # 비스트림 응답 생성
                 response = await self.llm_service.generate_response(
                     messages=context_messages,
-                    system_prompt=agent_system_prompt,
+                    system_prompt=(system_prompt, agent_system_prompt),
                     callback=self._log_agent_response
                 )
             
-            # 최종 메시지 생성 및 추가
+            # 최종 메시지 생성 및 추가 (턴 수 증가)
+            # LLM 응답은 외부 값이므로 시스템 메시지와 달리 검증을 거쳐 생성
             message = Message(
                 speaker=agent.name,
                 content=response,
                 agent_id=agent.id,
-                timestamp=datetime.now(),
                 turn_number=conversation.current_turn + 1
             )
-            conversation.messages.append(message)
-            
-            # 턴 수 증가
             conversation.current_turn += 1
-            
-            # 메모리에 저장
-            await self.memory_service.save_conversation(conversation)
+            # 메시지 추가 및 메모리에 저장 (백그라운드)
+            self._record_message(conversation, message)
             
             # 최종 콜백 실행
             await self._execute_callbacks(conversation.id, message)
             
-            logger.info(f"에이전트 발화 완료: {agent.name} - {response}")
+            # 컨텍스트에서 밀려난 메시지 요약 갱신 (설정 시, 클라이언트 전송을 막지 않도록 백그라운드)
+            self._summarize_in_background(conversation)
+            
+            logger.info("에이전트 발화 완료: %s", agent.name)
+            logger.debug("에이전트 %s 응답: %s", agent.name, response)
             
         except Exception as e:
             logger.error(f"에이전트 발화 오류: {str(e)}")
             raise
     
     def _create_system_prompt(self, conversation: Conversation) -> str:
-        """시스템 프롬프트 생성"""
+        """시스템 프롬프트 생성 (대화별로 만들어 둔 틀에 턴 정보만 채움)"""
         is_unlimited = conversation.max_turns <= 0
         turn_info = "무제한" if is_unlimited else f"{conversation.current_turn}/{conversation.max_turns}"
-        all_agents = self.get_agents()
-        agent_map = {agent.id: agent for agent in all_agents}
-        agent_names = [agent_map.get(agent_id, agent_id).name for agent_id in conversation.agent_ids]
 
         # 남은 턴수에 따라 마무리 유도 메시지 생성
         turns_left_message = ""
@@ -358,9 +390,48 @@ class ConversationService:
             elif turns_left <= 3:
                 turns_left_message = f"이제 대화를 마무리할 준비를 하세요. (남은 턴: {turns_left})"
 
-        prompt = f"""당신은 AI 대화 시스템의 참여자입니다.\n\n대화 정보:\n- 주제: {conversation.topic}\n- 현재 턴: {turn_info}\n- 참여자: {', '.join(agent_names)}\n\n대화 규칙:\n1. 주제 \"{conversation.topic}\"에 집중하여 관련성 있는 대화를 이어가세요\n2. 다른 참여자의 발화에 적절히 반응하되, 주제에서 벗어나지 마세요\n3. 주제와 관련된 깊이 있는 논의를 하세요\n4. 무제한 대화인 경우 서두르지 말고 충분히 대화를 이어가세요\n5. 자신의 이름을 반복해서 언급하지 마세요\n6. 응답 시작에 이름을 붙이지 마세요 (예: \"몽키 D 루피:\", \"이마케팅:\" 등)\n7. 자연스럽게 대화에 참여하세요\n\n{turns_left_message}\n\n현재 대화 상황을 파악하고 주제에 맞는 적절한 응답을 생성하세요."""
+        prompt = self._prompt_template_for(conversation).format(turn_info=turn_info, turns_left_message=turns_left_message)
+        if conversation.context_summary:
+            prompt += f"\n\n이전 대화 요약:\n{conversation.context_summary}"
         return prompt
     
+    def _prompt_template_for(self, conversation: Conversation) -> str:
+        """주제/참여자가 반영된 시스템 프롬프트 틀 (대화당 한 번만 생성)"""
+        if conversation._prompt_template is None:
+            _, agent_map = self.get_agents_snapshot()
+            agent_names = [agent_map[agent_id].name if agent_id in agent_map else agent_id for agent_id in conversation.agent_ids]
+            # 주제/이름에 들어 있는 중괄호가 format 자리표시자로 해석되지 않도록 이스케이프
+            topic = conversation.topic.replace("{", "{{").replace("}", "}}")
+            participants = ", ".join(agent_names).replace("{", "{{").replace("}", "}}")
+            conversation._prompt_template = f"""당신은 AI 대화 시스템의 참여자입니다.\n\n대화 정보:\n- 주제: {topic}\n- 현재 턴: {{turn_info}}\n- 참여자: {participants}\n\n대화 규칙:\n1. 주제 \"{topic}\"에 집중하여 관련성 있는 대화를 이어가세요\n2. 다른 참여자의 발화에 적절히 반응하되, 주제에서 벗어나지 마세요\n3. 주제와 관련된 깊이 있는 논의를 하세요\n4. 무제한 대화인 경우 서두르지 말고 충분히 대화를 이어가세요\n5. 자신의 이름을 반복해서 언급하지 마세요\n6. 응답 시작에 이름을 붙이지 마세요 (예: \"몽키 D 루피:\", \"이마케팅:\" 등)\n7. 자연스럽게 대화에 참여하세요\n\n{{turns_left_message}}\n\n현재 대화 상황을 파악하고 주제에 맞는 적절한 응답을 생성하세요."""
+        return conversation._prompt_template
+    
+    async def _update_context_summary(self, conversation: Conversation):
+        """컨텍스트 창에서 밀려난 메시지가 일정 개수 쌓이면 기존 요약과 합쳐 다시 요약"""
+        batch = settings.conversation_summary_batch
+        context_limit = settings.conversation_context_limit
+        if batch <= 0 or context_limit <= 0:
+            return
+        
+        window_start = len(conversation.messages) - context_limit
+        if window_start - conversation.summarized_count < batch:
+            return
+        
+        evicted = conversation.messages[conversation.summarized_count:window_start]
+        summary_prompt = SUMMARY_PROMPT.format(
+            topic=conversation.topic,
+            previous_summary=conversation.context_summary or "(없음)"
+        )
+        try:
+            summary = await self.llm_service.generate_response(messages=evicted, system_prompt=summary_prompt)
+        except Exception as e:
+            # 요약에 실패해도 대화는 계속 진행하고, 다음 턴에 같은 범위를 다시 요약
+            logger.warning(f"대화 요약 실패: {str(e)}")
+            return
+        
+        conversation.context_summary = summary.strip()
+        conversation.summarized_count = window_start
+    
     def _create_context_messages(self, conversation: Conversation) -> List[Message]:
         """대화 컨텍스트 메시지 생성"""
         # 최근 메시지들만 사용 (컨텍스트 제한)
@@ -372,13 +443,15 @@ class ConversationService:
     def _select_next_agent(self, conversation: Conversation) -> Agent:
         """다음 발화할 에이전트 선택"""
         # 라운드 로빈 방식으로 에이전트 선택
-        agent_index = conversation.current_turn % len(conversation.agent_ids)
-        agent_id = conversation.agent_ids[agent_index]
-        
-        # 에이전트 정보 가져오기
-        all_agents = self.get_agents()
-        agent_map = {agent.id: agent for agent in all_agents}
-        return agent_map[agent_id]
+        turn_agents = self._turn_agents_for(conversation)
+        return turn_agents[conversation.current_turn % len(turn_agents)]
+    
+    def _turn_agents_for(self, conversation: Conversation) -> Tuple[Agent, ...]:
+        """발화 순서대로 정렬된 참여 에이전트 (저장소에서 불러온 대화는 최초 사용 시 생성)"""
+        if conversation._turn_agents is None:
+            _, agent_map = self.get_agents_snapshot()
+            conversation._turn_agents = tuple(agent_map[agent_id] for agent_id in conversation.agent_ids if agent_id in agent_map)
+        return conversation._turn_agents
     
     def _should_end_conversation(self, conversation: Conversation) -> bool:
         """대화 종료 여부 확인"""
@@ -392,50 +465,119 @@ class ConversationService:
         return False
     
     async def _execute_callbacks(self, conversation_id: str, message: Message, is_stream: bool = False):
-        """콜백 함수 실행"""
+        """콜백 함수 실행
+        
+        동기 콜백은 이벤트 루프에서 바로 호출하고, 비동기 콜백은 함께 실행하여
+        느린 콜백 하나가 나머지를 기다리게 하지 않는다.
+        """
+        coroutines = []
+        
         # 대화별 콜백 실행
-        if conversation_id in self.conversation_callbacks:
-            for callback in self.conversation_callbacks[conversation_id]:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(message)
-                    else:
-                        callback(message)
-                except Exception as e:
-                    logger.error(f"대화 콜백 실행 오류: {str(e)}")
+        for callback, is_coroutine in self.conversation_callbacks.get(conversation_id, ()):
+            try:
+                if is_coroutine:
+                    coroutines.append(callback(message))
+                else:
+                    callback(message)
+            except Exception as e:
+                logger.error(f"대화 콜백 실행 오류: {str(e)}")
         
         # 전역 메시지 콜백 실행
-        for callback in self.message_callbacks:
+        for callback, is_coroutine in self.message_callbacks:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(conversation_id, message)
+                if is_coroutine:
+                    coroutines.append(callback(conversation_id, message))
                 else:
                     callback(conversation_id, message)
             except Exception as e:
                 logger.error(f"메시지 콜백 실행 오류: {str(e)}")
+        
+        if not coroutines:
+            return
+        if len(coroutines) == 1:
+            # 콜백이 하나면 gather의 태스크 생성 비용 없이 바로 대기
+            try:
+                await coroutines[0]
+            except Exception as e:
+                logger.error(f"콜백 실행 오류: {str(e)}")
+            return
+        for result in await asyncio.gather(*coroutines, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"콜백 실행 오류: {str(result)}")
+    
+    def _record_message(self, conversation: Conversation, message: Message, persist: bool = True):
+        """메시지를 대화에 추가하고 대기자를 깨움 (persist면 백그라운드 저장까지 예약)"""
+        conversation.messages.append(message)
+        conversation.updated_at = datetime.fromtimestamp(message.timestamp)
+        self._notify_new_message(conversation.id)
+        if persist:
+            self._save_in_background(conversation)
+    
+    def get_message_event(self, conversation_id: str) -> asyncio.Event:
+        """대화에 새 메시지가 추가되거나 상태가 바뀌면 set 되는 이벤트 조회"""
+        event = self._message_events.get(conversation_id)
+        if event is None:
+            event = self._message_events[conversation_id] = asyncio.Event()
+        return event
+    
+    def _notify_new_message(self, conversation_id: str):
+        """새 메시지 대기자 깨우기"""
+        event = self._message_events.get(conversation_id)
+        if event is not None:
+            event.set()
+    
+    async def wait_turn_interval(self, conversation_id: str) -> bool:
+        """턴 간격만큼 대기 - 대기 중 대화가 중지/종료되면 즉시 True 반환"""
+        stop_event = self._stop_events.get(conversation_id)
+        if stop_event is None:
+            stop_event = self._stop_events[conversation_id] = asyncio.Event()
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.conversation_turn_interval)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _signal_stop(self, conversation_id: str):
+        """턴 간격 대기 중인 자동 진행 깨우기"""
+        stop_event = self._stop_events.get(conversation_id)
+        if stop_event is not None:
+            stop_event.set()
     
     def _log_agent_response(self, response: str):
         """에이전트 응답 로깅 - 전체 내용 추적 감사용"""
-        logger.info(f"에이전트 응답: {response}")
+        logger.info("에이전트 응답: %s", response)
     
     def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
-        """대화 조회"""
+        """대화 조회 - 복사본이 아닌 서비스가 갱신하는 객체 자체를 반환"""
         return self.active_conversations.get(conversation_id)
     
+    def messages_since(self, conversation_id: str, cursor: int) -> Tuple[List[Message], int]:
+        """cursor 이후에 추가된 메시지와 새 cursor 반환 (메시지 목록은 추가만 되므로 길이를 cursor로 사용)"""
+        conversation = self.active_conversations.get(conversation_id)
+        if not conversation:
+            return [], cursor
+        messages = conversation.messages
+        return messages[cursor:], len(messages)
+    
     def get_all_conversations(self) -> List[Conversation]:
         """모든 활성 대화 조회"""
         return list(self.active_conversations.values())
     
     def get_agents(self) -> List[Agent]:
-        """모든 에이전트 조회"""
+        """모든 에이전트 조회 (agents.json이 바뀐 경우에만 다시 로드)"""
+        return list(self.get_agents_snapshot()[0])
+    
+    def _reload_agents(self) -> List[Agent]:
+        """agents.json을 다시 읽고 스냅샷 갱신"""
         try:
+            try:
+                mtime = os.stat(AGENTS_FILE).st_mtime_ns
+            except OSError:
+                mtime = None
+
             # agents.json 파일에서 에이전트 정보 로드
-            import json
-            import os
-            
-            agents_file = os.path.join(os.path.dirname(__file__), '..', '..', 'agents.json')
-            with open(agents_file, 'r', encoding='utf-8') as f:
-                agents_data = json.load(f)
+            with open(AGENTS_FILE, 'rb') as f:
+                agents_data = orjson.loads(f.read())
             
             agents = []
             for agent_id, agent_data in agents_data["agents"].items():
@@ -449,12 +591,92 @@ class ConversationService:
                 )
                 agents.append(agent)
             
+            # 스냅샷과 ID 기반 조회용 인덱스 갱신
+            self._agents_cache = tuple(agents)
+            self._agent_index = {agent.id: agent for agent in agents}
+            self._agents_mtime = mtime
+            self._agents_version += 1
             return agents
             
         except Exception as e:
             logger.error(f"에이전트 로드 오류: {str(e)}")
             return []
     
+    def get_agents_snapshot(self) -> Tuple[Tuple[Agent, ...], Dict[str, Agent]]:
+        """공유 에이전트 스냅샷 (목록, ID 인덱스) 조회 - agents.json이 바뀔 때만 다시 로드
+
+        반환된 객체는 여러 호출자가 공유하므로 수정하지 않는다.
+        """
+        try:
+            mtime = os.stat(AGENTS_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is None or mtime != self._agents_mtime:
+            self._reload_agents()
+        return self._agents_cache, self._agent_index
+
+    @property
+    def agents_version(self) -> int:
+        """에이전트 스냅샷 버전 (다시 로드될 때마다 증가)"""
+        return self._agents_version
+
+    def get_agent_by_id(self, agent_id: str) -> Optional[Agent]:
+        """ID로 에이전트 조회 (O(1))"""
+        return self.get_agents_snapshot()[1].get(agent_id)
+    
+    def _summarize_in_background(self, conversation: Conversation):
+        """컨텍스트 요약 갱신을 기다리지 않고 예약 (앞선 요약이 끝난 뒤 실행, 다음 턴 프롬프트는 완료된 요약을 사용)"""
+        if settings.conversation_summary_batch <= 0:
+            return
+        conversation_id = conversation.id
+        previous = self._pending_summaries.get(conversation_id)
+        task = asyncio.create_task(self._summarize_after(previous, conversation))
+        self._pending_summaries[conversation_id] = task
+        
+        def _discard(done: asyncio.Task):
+            if self._pending_summaries.get(conversation_id) is done:
+                del self._pending_summaries[conversation_id]
+        
+        task.add_done_callback(_discard)
+    
+    async def _summarize_after(self, previous: Optional[asyncio.Task], conversation: Conversation):
+        """앞선 요약이 끝난 뒤 요약을 갱신하고, 바뀌었으면 저장 예약"""
+        if previous is not None:
+            await previous
+        summarized_count = conversation.summarized_count
+        await self._update_context_summary(conversation)
+        if conversation.summarized_count != summarized_count:
+            self._save_in_background(conversation)
+    
+    def _save_in_background(self, conversation: Conversation):
+        """대화 저장을 기다리지 않고 예약 (다음 LLM 호출과 겹쳐 실행)"""
+        conversation_id = conversation.id
+        previous = self._pending_saves.get(conversation_id)
+        task = asyncio.create_task(self._save_after(previous, conversation))
+        self._pending_saves[conversation_id] = task
+        
+        def _discard(done: asyncio.Task):
+            if self._pending_saves.get(conversation_id) is done:
+                del self._pending_saves[conversation_id]
+        
+        task.add_done_callback(_discard)
+    
+    async def _save_after(self, previous: Optional[asyncio.Task], conversation: Conversation):
+        """앞선 저장이 끝난 뒤 저장 (오래된 상태가 나중에 기록되지 않도록)"""
+        if previous is not None:
+            await previous
+        await self.memory_service.save_conversation(conversation)
+    
+    async def flush_pending_saves(self, conversation_id: Optional[str] = None):
+        """진행 중인 백그라운드 저장 완료 대기 (대화 ID 지정 시 해당 대화만)"""
+        if conversation_id is not None:
+            task = self._pending_saves.get(conversation_id)
+            if task is not None:
+                await task
+            return
+        if self._pending_saves:
+            await asyncio.gather(*self._pending_saves.values())
+    
     async def delete_conversation(self, conversation_id: str) -> bool:
         """대화 삭제"""
         try:
@@ -462,6 +684,12 @@ class ConversationService:
             if not conversation:
                 return False
             
+            # 삭제 후 요약/저장이 끝나 대화가 다시 기록되지 않도록 요약은 취소하고 저장은 먼저 대기
+            summary_task = self._pending_summaries.pop(conversation_id, None)
+            if summary_task is not None:
+                summary_task.cancel()
+            await self.flush_pending_saves(conversation_id)
+            
             # 메모리에서 삭제
             await self.memory_service.delete_conversation(conversation_id)
             
@@ -471,6 +699,11 @@ class ConversationService:
             # 콜백 정리
             if conversation_id in self.conversation_callbacks:
                 del self.conversation_callbacks[conversation_id]
+            event = self._message_events.pop(conversation_id, None)
+            if event is not None:
+                event.set()
+            self._signal_stop(conversation_id)
+            self._stop_events.pop(conversation_id, None)
             
             logger.info(f"대화 삭제됨: {conversation_id}")
             return True
@@ -1,13 +1,40 @@
 import asyncio
-import json
+import functools
+import importlib.util
 import logging
-from typing import List, Dict, Any, Optional, Callable
-from openai import AsyncOpenAI
+from typing import List, Dict, Any, Optional, Callable, Sequence, Union
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from app.models.conversation import Message
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2는 h2 패키지(httpx[http2])가 설치된 경우에만 사용 (TLS 엔드포인트에서 요청 다중화)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 클라이언트 연결 풀 크기 (동시 대화들이 keep-alive 연결을 재사용)
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=256)
+
+
+@functools.cache
+def _get_client(base_url: Optional[str], api_key: str) -> AsyncOpenAI:
+    """접속 설정별 AsyncOpenAI 클라이언트 (같은 설정이면 모든 LLMService가 하나의 연결 풀을 공유)"""
+    return AsyncOpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=DefaultAsyncHttpxClient(http2=_HTTP2_AVAILABLE, limits=_HTTP_LIMITS)
+    )
+
+# 시스템 안내 메시지의 발화자 이름
+SYSTEM_SPEAKER = "시스템"
+
+# 시스템 프롬프트: 문자열 하나 또는 빈 줄로 이어 붙일 섹션들 (예: 기본 프롬프트, 에이전트 프롬프트)
+SystemPrompt = Union[str, Sequence[str]]
+
+# 스트림 콜백 최소 호출 간격(초) - 토큰마다 호출하지 않고 이 간격 동안 받은 조각을 모아 한 번에 전달
+STREAM_CALLBACK_INTERVAL = 0.03
+
 class LLMService:
     """LLM 서비스 클래스"""
     
@@ -20,23 +47,15 @@ class LLMService:
         """LLM 클라이언트 설정"""
         try:
             if self.provider == "vllm":
-                self.client = AsyncOpenAI(
-                    base_url=settings.vllm_url,
-                    api_key="not-needed"
-                )
+                self.client = _get_client(settings.vllm_url, "not-needed")
                 logger.info(f"vLLM 클라이언트 초기화됨: {settings.vllm_url}")
             elif self.provider == "openai":
                 if not settings.openai_api_key:
                     raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
-                self.client = AsyncOpenAI(
-                    api_key=settings.openai_api_key
-                )
+                self.client = _get_client(None, settings.openai_api_key)
                 logger.info("OpenAI 클라이언트 초기화됨")
             elif self.provider == "ollama":
-                self.client = AsyncOpenAI(
-                    base_url=settings.ollama_url,
-                    api_key="not-needed"
-                )
+                self.client = _get_client(settings.ollama_url, "not-needed")
                 logger.info(f"Ollama 클라이언트 초기화됨: {settings.ollama_url}")
             else:
                 raise ValueError(f"지원하지 않는 LLM 제공자: {self.provider}")
@@ -47,7 +66,7 @@ class LLMService:
     async def generate_response(
         self,
         messages: List[Message],
-        system_prompt: str,
+        system_prompt: SystemPrompt,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         callback: Optional[Callable] = None
@@ -57,12 +76,13 @@ class LLMService:
             # 메시지 포맷 변환
             formatted_messages = self._format_messages(messages, system_prompt)
             
-            # 디버깅을 위한 로깅
-            logger.info(f"LLM 요청 - 제공자: {self.provider}")
-            logger.info(f"시스템 프롬프트: {system_prompt}")
-            logger.info(f"포맷된 메시지 수: {len(formatted_messages)}")
-            for i, msg in enumerate(formatted_messages):
-                logger.info(f"포맷된 메시지 {i}: role={msg['role']}, content={msg['content']}")
+            # 디버깅을 위한 로깅 (DEBUG 레벨이 꺼져 있으면 문자열을 만들지 않음)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("LLM 요청 - 제공자: %s", self.provider)
+                logger.debug("시스템 프롬프트: %s", system_prompt)
+                logger.debug("포맷된 메시지 수: %d", len(formatted_messages))
+                for i, msg in enumerate(formatted_messages):
+                    logger.debug("포맷된 메시지 %d: role=%s, content=%s", i, msg['role'], msg['content'])
             
             # 설정값 적용
             max_tokens = max_tokens or settings.vllm_max_tokens
@@ -98,19 +118,25 @@ class LLMService:
     async def generate_response_stream(
         self,
         messages: List[Message],
-        system_prompt: str,
+        system_prompt: SystemPrompt,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
-        stream_callback: Optional[Callable] = None
+        stream_callback: Optional[Callable] = None,
+        stream_interval: float = STREAM_CALLBACK_INTERVAL
     ):
-        """LLM 응답 생성 (스트림)"""
+        """LLM 응답 생성 (스트림)
+
+        stream_callback(chunk, full_content)은 stream_interval마다 최대 한 번 호출되며,
+        chunk는 직전 호출 이후 받은 조각을 이어 붙인 문자열이다. 마지막 조각은 스트림 종료 시 전달된다.
+        """
         try:
             # 메시지 포맷 변환
             formatted_messages = self._format_messages(messages, system_prompt)
             
-            # 디버깅을 위한 로깅
-            logger.info(f"LLM 스트림 요청 - 제공자: {self.provider}")
-            logger.info(f"시스템 프롬프트: {system_prompt}")
+            # 디버깅을 위한 로깅 (DEBUG 레벨이 꺼져 있으면 문자열을 만들지 않음)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("LLM 스트림 요청 - 제공자: %s", self.provider)
+                logger.debug("시스템 프롬프트: %s", system_prompt)
             
             # 설정값 적용
             max_tokens = max_tokens or settings.vllm_max_tokens
@@ -128,19 +154,39 @@ class LLMService:
                 stream=True
             )
             
-            full_content = ""
+            # 조각은 리스트에 모으고, 전체 문자열은 콜백을 호출할 때와 마지막에만 만든다
+            parts: List[str] = []
+            flushed = 0  # 콜백에 이미 전달한 조각 수
+            is_async_callback = asyncio.iscoroutinefunction(stream_callback)
+            loop = asyncio.get_running_loop()
+            last_emit = float("-inf")
             
             async for chunk in stream:
-                if chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    full_content += content
+                content = chunk.choices[0].delta.content
+                if content is not None:
+                    parts.append(content)
                     
-                    # 스트림 콜백 실행
+                    # 스트림 콜백 실행 (간격 내에 들어온 조각은 모아서 전달)
                     if stream_callback:
-                        if asyncio.iscoroutinefunction(stream_callback):
-                            await stream_callback(content, full_content)
-                        else:
-                            stream_callback(content, full_content)
+                        now = loop.time()
+                        if now - last_emit >= stream_interval:
+                            last_emit = now
+                            pending = "".join(parts[flushed:])
+                            flushed = len(parts)
+                            if is_async_callback:
+                                await stream_callback(pending, "".join(parts))
+                            else:
+                                stream_callback(pending, "".join(parts))
+            
+            full_content = "".join(parts)
+            
+            # 간격 때문에 전달하지 못한 마지막 조각 전달
+            if stream_callback and flushed < len(parts):
+                pending = "".join(parts[flushed:])
+                if is_async_callback:
+                    await stream_callback(pending, full_content)
+                else:
+                    stream_callback(pending, full_content)
             
             return full_content
             
@@ -148,40 +194,32 @@ class LLMService:
             logger.error(f"LLM 스트림 응답 생성 오류: {str(e)}")
             raise
     
-    def _format_messages(self, messages: List[Message], system_prompt: str) -> List[Dict[str, str]]:
+    def _format_messages(self, messages: List[Message], system_prompt: SystemPrompt) -> List[Dict[str, str]]:
         """메시지를 LLM 형식으로 변환"""
-        formatted = []
+        sections = (system_prompt,) if isinstance(system_prompt, str) else system_prompt
+        # 시스템 메시지(시작/중지 안내)는 LLM에 전달하지 않음
+        lines = [f"{message.speaker}: {message.content}" for message in messages if message.speaker != SYSTEM_SPEAKER]
         
         # vLLM의 경우 단순한 user/assistant 형식 사용
         if self.provider == "vllm":
-            # 시스템 프롬프트와 대화 내용을 하나의 user 메시지로 결합
-            full_content = system_prompt + "\n\n"
-            
-            # 대화 메시지들을 추가
-            for message in messages:
-                if message.speaker != "시스템":
-                    full_content += f"{message.speaker}: {message.content}\n"
-            
-            # 단일 user 메시지로 전송
-            formatted.append({
+            # 시스템 프롬프트 섹션과 대화 내용을 하나의 user 메시지로 결합 (한 번의 join으로 생성)
+            parts = []
+            for section in sections:
+                parts += (section, "")
+            return [{
                 "role": "user",
-                "content": full_content.strip()
+                "content": "\n".join([*parts, *lines]).strip()
+            }]
+        
+        # 다른 제공자들은 표준 형식 사용
+        formatted = []
+        system_content = "\n\n".join(sections)
+        if system_content:
+            formatted.append({
+                "role": "system",
+                "content": system_content
             })
-        else:
-            # 다른 제공자들은 표준 형식 사용
-            if system_prompt:
-                formatted.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-            
-            # 대화 메시지들을 추가
-            for message in messages:
-                if message.speaker != "시스템":
-                    formatted.append({
-                        "role": "user",
-                        "content": f"{message.speaker}: {message.content}"
-                    })
+        formatted.extend({"role": "user", "content": line} for line in lines)
         
         return formatted
     
@@ -1,22 +1,60 @@
+import atexit
+import functools
+import hashlib
 import logging
 import logging.handlers
-import json
 import os
+import re
 import sys
+import time
 import uuid
+import orjson
 from datetime import datetime
 from typing import Dict, Any, Optional
 from app.config import settings
 
-# 전역 로깅 서비스 인스턴스
-_logging_service = None
+# 로그 레코드 직렬화 옵션 (details에 정수 키가 있어도 json.dumps처럼 문자열 키로 기록)
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
 
+
+def _dumps(log_entry: Dict[str, Any]) -> str:
+    """로그 항목을 JSON 문자열로 변환 (직렬화할 수 없는 값은 str로 기록)"""
+    return orjson.dumps(log_entry, default=str, option=_ORJSON_OPTIONS).decode()
+
+
+# 로그 파일 크기 문자열 ("10MB", "512KB", "1048576" 등)과 단위별 배수
+_SIZE_RE = re.compile(r"^\s*(\d+)\s*([KMG]?B?)\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1 << 10, "KB": 1 << 10, "M": 1 << 20, "MB": 1 << 20, "G": 1 << 30, "GB": 1 << 30}
+
+# 초 단위 ISO 시각 캐시 - 같은 초에 기록된 레코드들은 datetime 생성/포맷을 한 번만 한다
+_TIMESTAMP_CACHE: Dict[int, str] = {}
+
+
+def _iso_timestamp(created: float) -> str:
+    """datetime.fromtimestamp(created).isoformat()과 같은 문자열 (초 부분은 캐시)"""
+    seconds = int(created)
+    # fromtimestamp와 같은 방식(반올림)으로 마이크로초 계산
+    microseconds = round((created - seconds) * 1e6)
+    if seconds < 0 or microseconds >= 1_000_000:
+        return datetime.fromtimestamp(created).isoformat()
+    base = _TIMESTAMP_CACHE.get(seconds)
+    if base is None:
+        if len(_TIMESTAMP_CACHE) > 4:
+            _TIMESTAMP_CACHE.clear()
+        base = _TIMESTAMP_CACHE[seconds] = datetime.fromtimestamp(seconds).isoformat()
+    return f"{base}.{microseconds:06d}" if microseconds else base
+
+
+@functools.cache
 def get_logging_service():
     """로깅 서비스 인스턴스 반환 (싱글톤)"""
-    global _logging_service
-    if _logging_service is None:
-        _logging_service = LoggingService()
-    return _logging_service
+    return LoggingService()
+
+# ECSFormatter가 ECS 필드로 옮기는 extra 키들
+_ECS_EXTRA_KEYS = frozenset({
+    "conversation_id", "agent_name", "turn_number", "details", "error_type", "error_message",
+    "model", "messages_count", "max_tokens", "temperature", "response_time", "topic", "agents",
+})
 
 # ECS 포맷터 클래스를 모듈 레벨로 정의
 class ECSFormatter(logging.Formatter):
@@ -24,23 +62,22 @@ class ECSFormatter(logging.Formatter):
         super().__init__()
         self.service_name = service_name
         self.service_version = service_version
+        # 레코드와 무관한 고정 필드는 한 번만 만들어 모든 레코드가 공유 (직렬화만 하고 수정하지 않음)
+        self._ecs = {"version": "1.6.0"}
+        self._service = {"name": service_name, "version": service_version}
     
     def format(self, record):
         # ECS 기본 필드
+        log = {
+            "level": record.levelname.lower(),
+            "logger": record.name
+        }
         log_entry = {
-            "@timestamp": datetime.fromtimestamp(record.created).isoformat(),
-            "log": {
-                "level": record.levelname.lower(),
-                "logger": record.name
-            },
+            "@timestamp": _iso_timestamp(record.created),
+            "log": log,
             "message": record.getMessage(),
-            "ecs": {
-                "version": "1.6.0"
-            },
-            "service": {
-                "name": self.service_name,
-                "version": self.service_version
-            },
+            "ecs": self._ecs,
+            "service": self._service,
             "process": {
                 "name": record.processName,
                 "pid": record.process
@@ -53,7 +90,7 @@ class ECSFormatter(logging.Formatter):
         
         # 소스 코드 위치 정보
         if record.pathname and record.lineno:
-            log_entry["log"]["origin"] = {
+            log["origin"] = {
                 "file": {
                     "name": os.path.basename(record.pathname),
                     "line": record.lineno
@@ -61,55 +98,89 @@ class ECSFormatter(logging.Formatter):
             }
         
         # 예외 정보 추가
+        error = {}
         if record.exc_info:
-            log_entry["error"] = {
-                "type": record.exc_info[0].__name__ if record.exc_info[0] else "Exception",
-                "message": str(record.exc_info[1]) if record.exc_info[1] else "",
-                "stack_trace": self.formatException(record.exc_info)
-            }
+            error["type"] = record.exc_info[0].__name__ if record.exc_info[0] else "Exception"
+            error["message"] = str(record.exc_info[1]) if record.exc_info[1] else ""
+            error["stack_trace"] = self.formatException(record.exc_info)
+        
+        # extra가 없는 레코드(대부분의 모듈 로거 출력)는 아래 필드 검사를 한 번의 집합 연산으로 건너뜀
+        fields = record.__dict__
+        if not _ECS_EXTRA_KEYS.isdisjoint(fields):
+            self._add_extra_fields(log_entry, fields, error)
+        if error:
+            log_entry["error"] = error
         
+        return _dumps(log_entry)
+    
+    @staticmethod
+    def _add_extra_fields(log_entry: Dict[str, Any], fields: Dict[str, Any], error: Dict[str, Any]) -> None:
+        """레코드의 extra 값을 ECS 필드로 추가 (error 항목은 error에 병합)"""
         # 추가 필드들 (ECS 호환)
-        if hasattr(record, 'conversation_id'):
-            log_entry["labels"] = {"conversation_id": record.conversation_id}
-        if hasattr(record, 'agent_name'):
-            log_entry["labels"] = log_entry.get("labels", {})
-            log_entry["labels"]["agent_name"] = record.agent_name
-        if hasattr(record, 'turn_number'):
-            log_entry["labels"] = log_entry.get("labels", {})
-            log_entry["labels"]["turn_number"] = record.turn_number
+        labels = {}
+        if 'conversation_id' in fields:
+            labels["conversation_id"] = fields['conversation_id']
+        if 'agent_name' in fields:
+            labels["agent_name"] = fields['agent_name']
+        if 'turn_number' in fields:
+            labels["turn_number"] = fields['turn_number']
+        if labels:
+            log_entry["labels"] = labels
         
         # 사용자 정의 필드들
-        if hasattr(record, 'details') and record.details:
-            log_entry["event"] = log_entry.get("event", {})
-            log_entry["event"]["details"] = record.details
+        details = fields.get('details')
+        if details:
+            log_entry["event"] = {"details": details}
         
         # 에러 타입별 분류
-        if hasattr(record, 'error_type'):
-            log_entry["error"] = log_entry.get("error", {})
-            log_entry["error"]["type"] = record.error_type
-        
-        if hasattr(record, 'error_message'):
-            log_entry["error"] = log_entry.get("error", {})
-            log_entry["error"]["message"] = record.error_message
+        if 'error_type' in fields:
+            error["type"] = fields['error_type']
+        if 'error_message' in fields:
+            error["message"] = fields['error_message']
         
         # LLM 관련 필드
-        if hasattr(record, 'model'):
+        if 'model' in fields:
             log_entry["llm"] = {
-                "model": record.model,
-                "messages_count": getattr(record, 'messages_count', None),
-                "max_tokens": getattr(record, 'max_tokens', None),
-                "temperature": getattr(record, 'temperature', None),
-                "response_time": getattr(record, 'response_time', None)
+                "model": fields['model'],
+                "messages_count": fields.get('messages_count'),
+                "max_tokens": fields.get('max_tokens'),
+                "temperature": fields.get('temperature'),
+                "response_time": fields.get('response_time')
             }
         
         # 대화 관련 필드
-        if hasattr(record, 'topic'):
+        if 'topic' in fields:
             log_entry["conversation"] = {
-                "topic": record.topic,
-                "agents": getattr(record, 'agents', [])
+                "topic": fields['topic'],
+                "agents": fields.get('agents', [])
             }
+
+# JSON 포맷터 클래스도 모듈 레벨로 정의 (기존 호환성 유지)
+class UnicodeSafeJSONFormatter(logging.Formatter):
+    def format(self, record):
+        log_entry = {
+            "timestamp": _iso_timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno
+        }
+        
+        # 예외 정보 추가
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        
+        # 추가 필드들
+        if hasattr(record, 'conversation_id'):
+            log_entry["conversation_id"] = record.conversation_id
+        if hasattr(record, 'agent_name'):
+            log_entry["agent_name"] = record.agent_name
+        if hasattr(record, 'turn_number'):
+            log_entry["turn_number"] = record.turn_number
         
-        return json.dumps(log_entry, ensure_ascii=False)
+        return _dumps(log_entry)
 
 class LoggingService:
     """ECS(Elastic Common Schema) 호환 로깅 서비스 클래스"""
@@ -117,6 +188,10 @@ class LoggingService:
     def __init__(self):
         self.service_name = "ai-agent-conversation-system"
         self.service_version = "1.0.0"
+        # 레벨 확인용 루트 로거 (log_* 메서드는 루트 로거로 기록)
+        self._logger = logging.getLogger()
+        # 에이전트 발화 전문 기록 파일 (LOG_AUDIT_FILE_PATH 지정 시 최초 기록 때 연다)
+        self._audit_file = None
         self._setup_logging()
     
     def _setup_logging(self):
@@ -176,32 +251,6 @@ class LoggingService:
     
     def _create_json_formatter(self):
         """JSON 포맷터 생성 (기존 호환성 유지)"""
-        class UnicodeSafeJSONFormatter(logging.Formatter):
-            def format(self, record):
-                log_entry = {
-                    "timestamp": datetime.fromtimestamp(record.created).isoformat(),
-                    "level": record.levelname,
-                    "logger": record.name,
-                    "message": record.getMessage(),
-                    "module": record.module,
-                    "function": record.funcName,
-                    "line": record.lineno
-                }
-                
-                # 예외 정보 추가
-                if record.exc_info:
-                    log_entry["exception"] = self.formatException(record.exc_info)
-                
-                # 추가 필드들
-                if hasattr(record, 'conversation_id'):
-                    log_entry["conversation_id"] = record.conversation_id
-                if hasattr(record, 'agent_name'):
-                    log_entry["agent_name"] = record.agent_name
-                if hasattr(record, 'turn_number'):
-                    log_entry["turn_number"] = record.turn_number
-                
-                return json.dumps(log_entry, ensure_ascii=False)
-        
         return UnicodeSafeJSONFormatter()
     
     def _create_text_formatter(self):
@@ -213,29 +262,25 @@ class LoggingService:
     
     def _parse_size(self, size_str: str) -> int:
         """크기 문자열을 바이트로 변환"""
-        size_str = size_str.upper()
-        if size_str.endswith('KB'):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith('MB'):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith('GB'):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        else:
-            return int(size_str)
+        match = _SIZE_RE.match(size_str)
+        if match is None:
+            raise ValueError(f"잘못된 크기 형식: {size_str}")
+        return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
     
     def log_conversation_start(self, conversation_id: str, topic: str, agents: list):
         """대화 시작 로깅"""
         if settings.log_include_agent_conversations:
+            agent_names = [agent.name for agent in agents]
             logging.info(
-                f"대화 시작 - ID: {conversation_id}, 주제: {topic}, 참여자: {[agent.name for agent in agents]}",
+                "대화 시작 - ID: %s, 주제: %s, 참여자: %s", conversation_id, topic, agent_names,
                 extra={
                     "conversation_id": conversation_id,
                     "topic": topic,
-                    "agents": [agent.name for agent in agents],
+                    "agents": agent_names,
                     "event": {"action": "conversation_started"},
                     "details": {
                         "participant_count": len(agents),
-                        "agent_names": [agent.name for agent in agents]
+                        "agent_names": agent_names
                     }
                 }
             )
@@ -244,7 +289,7 @@ class LoggingService:
         """대화 종료 로깅"""
         if settings.log_include_agent_conversations:
             logging.info(
-                f"대화 종료 - ID: {conversation_id}, 총 턴: {total_turns}",
+                "대화 종료 - ID: %s, 총 턴: %s", conversation_id, total_turns,
                 extra={
                     "conversation_id": conversation_id,
                     "total_turns": total_turns,
@@ -256,28 +301,73 @@ class LoggingService:
             )
     
     def log_agent_message(self, conversation_id: str, agent_name: str, message: str, turn_number: int):
-        """에이전트 메시지 로깅 - 전체 대화 내용 추적 감사용"""
-        if settings.log_include_agent_conversations:
-            logging.info(
-                f"에이전트 발화 - {agent_name} (턴 {turn_number}): {message}",
-                extra={
-                    "conversation_id": conversation_id,
-                    "agent_name": agent_name,
-                    "turn_number": turn_number,
-                    "message_length": len(message),
-                    "event": {"action": "agent_message_sent"},
-                    "details": {
-                        "full_message": message,  # 전체 대화 내용
-                        "message_length": len(message),
-                        "audit_trail": True  # 감사 추적 표시
-                    }
-                }
-            )
+        """에이전트 메시지 로깅 - 전체 대화 내용 추적 감사용
+        
+        LOG_AUDIT_FILE_PATH가 지정되면 전문은 감사 파일에 한 줄로 기록하고,
+        구조화 로그에는 SHA-256 해시와 길이만 남겨 로그 레코드 크기를 일정하게 유지한다.
+        """
+        if not settings.log_include_agent_conversations:
+            return
+        
+        if settings.log_audit_file_path:
+            self._write_audit({
+                "timestamp": _iso_timestamp(time.time()),
+                "conversation_id": conversation_id,
+                "turn_number": turn_number,
+                "agent_name": agent_name,
+                "message": message
+            })
+        
+        # 기록되지 않을 레코드면 메시지 문자열과 extra를 만들지 않음
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        
+        if settings.log_audit_file_path:
+            digest = hashlib.sha256(message.encode()).hexdigest()
+            text, details = f"sha256={digest}", {
+                "message_sha256": digest,
+                "message_length": len(message),
+                "audit_trail": True,  # 감사 추적 표시
+                "audit_file": settings.log_audit_file_path
+            }
+        else:
+            text, details = message, {
+                "full_message": message,  # 전체 대화 내용
+                "message_length": len(message),
+                "audit_trail": True  # 감사 추적 표시
+            }
+        logging.info(
+            "에이전트 발화 - %s (턴 %s): %s", agent_name, turn_number, text,
+            extra={
+                "conversation_id": conversation_id,
+                "agent_name": agent_name,
+                "turn_number": turn_number,
+                "message_length": len(message),
+                "event": {"action": "agent_message_sent"},
+                "details": details
+            }
+        )
+    
+    def _write_audit(self, entry: Dict[str, Any]):
+        """감사 파일에 한 줄(JSON) 추가 - 한 번의 write로 기록"""
+        try:
+            if self._audit_file is None:
+                log_dir = os.path.dirname(settings.log_audit_file_path)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                # 버퍼 없이 열어 줄마다 O_APPEND write 한 번으로 기록 (비정상 종료 시에도 유실 없음)
+                self._audit_file = open(settings.log_audit_file_path, "ab", buffering=0)
+                atexit.register(self._audit_file.close)
+            self._audit_file.write(orjson.dumps(entry, default=str) + b"\n")
+        except OSError as e:
+            logging.error("감사 파일 기록 오류: %s", e)
     
     def log_llm_request(self, model: str, messages_count: int, max_tokens: int, temperature: float, response_time: float):
         """LLM 요청 로깅"""
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         logging.info(
-            f"LLM 요청 - 모델: {model}, 메시지 수: {messages_count}, 응답 시간: {response_time:.2f}초",
+            "LLM 요청 - 모델: %s, 메시지 수: %s, 응답 시간: %.2f초", model, messages_count, response_time,
             extra={
                 "model": model,
                 "messages_count": messages_count,
@@ -298,7 +388,7 @@ class LoggingService:
     def log_error(self, error_type: str, error_message: str, context: Dict[str, Any] = None):
         """에러 로깅"""
         logging.error(
-            f"에러 발생 - 타입: {error_type}, 메시지: {error_message}",
+            "에러 발생 - 타입: %s, 메시지: %s", error_type, error_message,
             extra={
                 "error_type": error_type,
                 "error_message": error_message,
@@ -310,7 +400,7 @@ class LoggingService:
     def log_system_event(self, event_type: str, details: Dict[str, Any] = None):
         """시스템 이벤트 로깅"""
         logging.info(
-            f"시스템 이벤트 - {event_type}",
+            "시스템 이벤트 - %s", event_type,
             extra={
                 "event": {"action": event_type},
                 "details": details or {}
@@ -339,6 +429,8 @@ class LoggingService:
     
     def log_debug(self, message: str, details: Dict[str, Any] = None):
         """디버그 로깅"""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
         logging.debug(
             message,
             extra={
@@ -350,7 +442,7 @@ class LoggingService:
     def log_server_startup(self, host: str, port: int, debug: bool, llm_provider: str, memory_type: str):
         """서버 시작 로깅"""
         logging.info(
-            f"서버 시작 - {host}:{port}, LLM: {llm_provider}, 메모리: {memory_type}",
+            "서버 시작 - %s:%s, LLM: %s, 메모리: %s", host, port, llm_provider, memory_type,
             extra={
                 "event": {"action": "server_started"},
                 "details": {
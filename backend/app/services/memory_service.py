@@ -1,6 +1,6 @@
 import asyncio
-import json
 import logging
+import orjson
 from typing import List, Dict, Any, Optional
 from abc import ABC, abstractmethod
 import redis.asyncio as redis
@@ -51,8 +51,9 @@ class RedisStorage(MemoryInterface):
                 "message_content": message.content,
                 "message_timestamp": message.timestamp,
                 "message_turn_number": message.turn_number,
-                "message_metadata": message.metadata,
-                "context": context or {},
+                # Redis 해시 값은 문자열/바이트만 가능하므로 dict는 JSON으로 인코딩
+                "message_metadata": orjson.dumps(message.metadata),
+                "context": orjson.dumps(context or {}),
                 "importance_score": 0.5,
                 "created_at": datetime.now().isoformat()
             }
@@ -81,16 +82,16 @@ class RedisStorage(MemoryInterface):
                         content=data[b"message_content"].decode(),
                         timestamp=float(data[b"message_timestamp"]),
                         turn_number=int(data[b"message_turn_number"]),
-                        metadata=json.loads(data[b"message_metadata"]) if data[b"message_metadata"] else {}
+                        metadata=orjson.loads(data[b"message_metadata"]) if data[b"message_metadata"] else {}
                     )
                     
                     entry = MemoryEntry(
                         conversation_id=data[b"conversation_id"].decode(),
                         agent_id=data[b"agent_id"].decode(),
                         message=message,
-                        context=json.loads(data[b"context"]) if data[b"context"] else {},
+                        context=orjson.loads(data[b"context"]) if data[b"context"] else {},
                         importance_score=float(data[b"importance_score"]),
-                        created_at=datetime.fromisoformat(data[b"created_at"].decode())
+                        created_at=datetime.fromisoformat(data[b"created_at"].decode()).timestamp()
                     )
                     entries.append(entry)
             
@@ -112,16 +113,16 @@ class RedisStorage(MemoryInterface):
                         content=data[b"message_content"].decode(),
                         timestamp=float(data[b"message_timestamp"]),
                         turn_number=int(data[b"message_turn_number"]),
-                        metadata=json.loads(data[b"message_metadata"]) if data[b"message_metadata"] else {}
+                        metadata=orjson.loads(data[b"message_metadata"]) if data[b"message_metadata"] else {}
                     )
                     
                     entry = MemoryEntry(
                         conversation_id=data[b"conversation_id"].decode(),
                         agent_id=data[b"agent_id"].decode(),
                         message=message,
-                        context=json.loads(data[b"context"]) if data[b"context"] else {},
+                        context=orjson.loads(data[b"context"]) if data[b"context"] else {},
                         importance_score=float(data[b"importance_score"]),
-                        created_at=datetime.fromisoformat(data[b"created_at"].decode())
+                        created_at=datetime.fromisoformat(data[b"created_at"].decode()).timestamp()
                     )
                     entries.append(entry)
                     
@@ -220,7 +221,7 @@ class PostgreSQLStorage(MemoryInterface):
                         message=message,
                         context=row.context or {},
                         importance_score=row.importance_score,
-                        created_at=row.created_at
+                        created_at=row.created_at.timestamp()
                     )
                     entries.append(entry)
                 
@@ -257,7 +258,7 @@ class PostgreSQLStorage(MemoryInterface):
                         message=message,
                         context=row.context or {},
                         importance_score=row.importance_score,
-                        created_at=row.created_at
+                        created_at=row.created_at.timestamp()
                     )
                     entries.append(entry)
                 
@@ -300,7 +301,7 @@ class PostgreSQLStorage(MemoryInterface):
                         message=message,
                         context=row.context or {},
                         importance_score=row.importance_score,
-                        created_at=row.created_at
+                        created_at=row.created_at.timestamp()
                     )
                     entries.append(entry)
                 
@@ -458,8 +459,8 @@ class MemoryService:
             file_path = os.path.join(os.path.dirname(__file__), '../../../conversations.json')
             if os.path.exists(file_path):
                 try:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump({k: v.model_dump() for k, v in self.conversations.items()}, f, ensure_ascii=False, indent=2)
+                    with open(file_path, 'wb') as f:
+                        f.write(orjson.dumps({k: v.model_dump() for k, v in self.conversations.items()}, option=orjson.OPT_INDENT_2))
                 except Exception as e:
                     logger.error(f"파일 삭제 반영 오류: {str(e)}")
             return True
@@ -611,7 +612,7 @@ class MemoryService:
         try:
             # Pydantic 모델을 dict로 변환
             conversation_dict = conversation.model_dump()
-            return json.dumps(conversation_dict, ensure_ascii=False, default=str)
+            return orjson.dumps(conversation_dict, default=str).decode()
         except Exception as e:
             logger.error(f"대화 직렬화 오류: {str(e)}")
             return "{}"
@@ -619,7 +620,7 @@ class MemoryService:
     def _deserialize_conversation(self, conversation_data: str) -> Optional[Conversation]:
         """대화 객체 역직렬화"""
         try:
-            conversation_dict = json.loads(conversation_data)
+            conversation_dict = orjson.loads(conversation_data)
             return Conversation(**conversation_dict)
         except Exception as e:
             logger.error(f"대화 역직렬화 오류: {str(e)}")
@@ -0,0 +1,18 @@
+import pytest_asyncio
+from app.services.conversation_service import conversation_service
+from app.models.conversation import ConversationRequest
+
+
+@pytest_asyncio.fixture
+async def conv(request):
+    """테스트용 대화를 만들고 테스트가 끝나면 삭제 (indirect 파라미터로 요청 필드를 덮어씀)"""
+    fields = {
+        "title": "테스트",
+        "agent_ids": [conversation_service.get_agents()[0].id],
+        "max_turns": 1,
+        "topic": "테스트 주제",
+    }
+    fields.update(getattr(request, "param", {}))
+    conv = await conversation_service.create_conversation(ConversationRequest(**fields))
+    yield conv
+    await conversation_service.delete_conversation(conv.id)
@@ -1,7 +1,9 @@
+import asyncio
 import pytest
 from httpx import AsyncClient
 from app.main import app
 
+
 @pytest.mark.asyncio
 async def test_root():
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -9,6 +11,7 @@ async def test_root():
     assert resp.status_code == 200
     assert "AI Agent NPC" in resp.json()["message"]
 
+
 @pytest.mark.asyncio
 async def test_get_agents():
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -16,6 +19,7 @@ async def test_get_agents():
     assert resp.status_code == 200
     assert isinstance(resp.json(), list)
 
+
 @pytest.mark.asyncio
 async def test_get_conversations():
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -23,6 +27,7 @@ async def test_get_conversations():
     assert resp.status_code == 200
     assert isinstance(resp.json(), list)
 
+
 @pytest.mark.asyncio
 async def test_create_and_delete_conversation():
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -48,4 +53,159 @@ async def test_create_and_delete_conversation():
         assert del_resp.status_code == 200
         # 삭제 후 조회 시 404
         get_resp2 = await ac.get(f"/api/conversations/{conv_id}")
-        assert get_resp2.status_code == 404 
\ No newline at end of file
+        assert get_resp2.status_code == 404
+
+
+class FakeWebSocket:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_bytes(self, payload):
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(payload)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+@pytest.mark.asyncio
+async def test_broadcast_prunes_failed_connections():
+    from app.api.routes import ConnectionManager
+
+    manager = ConnectionManager()
+    ok, broken = FakeWebSocket(), FakeWebSocket(fail=True)
+    await manager.connect(ok)
+    await manager.connect(broken)
+
+    manager.broadcast(b"hello")
+    await asyncio.sleep(0.01)
+
+    assert ok.sent == [b"hello"]
+    assert list(manager.active_connections) == [ok]
+    assert broken.close_code == manager.CLOSE_INTERNAL_ERROR and ok.close_code is None
+    manager.disconnect(ok)
+
+
+@pytest.mark.asyncio
+async def test_overflowing_connection_is_closed():
+    from app.api.routes import ConnectionManager
+
+    manager = ConnectionManager()
+    manager.MAX_PENDING = 2
+    slow = FakeWebSocket()
+    await manager.connect(slow)
+
+    for payload in (b"1", b"2", b"3"):
+        manager.broadcast(payload)
+    await asyncio.sleep(0.01)
+
+    assert slow not in manager.active_connections
+    assert slow.close_code == manager.CLOSE_TRY_AGAIN_LATER
+
+
+@pytest.mark.asyncio
+async def test_broadcast_coalesces_pending_messages():
+    from app.api.routes import ConnectionManager
+
+    manager = ConnectionManager()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    for payload in (b'{"n":1}', b'{"n":2}', b'{"n":3}'):
+        manager.broadcast(payload)
+    await asyncio.sleep(0.01)
+
+    assert ws.sent == [b'[{"n":1},{"n":2},{"n":3}]']
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_batch_flattens_into_single_array():
+    from app.api.routes import ConnectionManager
+
+    manager = ConnectionManager()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    manager.broadcast_batch([b"1", b"2"])
+    manager.broadcast(b"3")
+    await asyncio.sleep(0.01)
+
+    assert ws.sent == [b"[1,2,3]"]
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_message_callback_preserves_order():
+    import orjson
+    from app.api.routes import manager, message_callback
+    from app.models.conversation import Message
+
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+    try:
+        for turn in (1, 2):
+            message_callback("conv", Message(speaker="a", content=str(turn), agent_id="a", turn_number=turn))
+        await asyncio.sleep(0.01)
+    finally:
+        manager.disconnect(ws)
+
+    frames = [orjson.loads(frame) for frame in ws.sent]
+    batch = [item for frame in frames for item in (frame if isinstance(frame, list) else [frame])]
+    assert [item["message"]["content"] for item in batch] == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_get_conversation_streams_valid_json(conv):
+    from app.models.conversation import Message
+
+    agent_id = conv.agent_ids[0]
+    for turn in range(300):
+        conv.messages.append(Message(speaker="a", content=f"msg {turn}", agent_id=agent_id, turn_number=turn))
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        resp = await ac.get(f"/api/conversations/{conv.id}")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["id"] == conv.id
+    assert [m["content"] for m in data["messages"]] == [f"msg {turn}" for turn in range(300)]
+    assert data["agent_states"] == {}
+
+
+@pytest.mark.asyncio
+async def test_writer_lingers_to_batch_close_messages():
+    from app.api.routes import ConnectionManager
+
+    manager = ConnectionManager()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    manager.broadcast(b"1")
+    await asyncio.sleep(0)
+    manager.broadcast(b"2")
+    await asyncio.sleep(0.02)
+
+    assert ws.sent == [b"[1,2]"]
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_lifespan_starts_and_stops_clock():
+    from app.api import routes
+
+    async with app.router.lifespan_context(app):
+        assert routes._clock_task is not None and not routes._clock_task.done()
+    assert routes._clock_task is None
+
+
+@pytest.mark.asyncio
+async def test_cors_wildcard_headers():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        resp = await ac.get("/", headers={"Origin": "http://example.com"})
+    assert resp.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in resp.headers
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cli_import_does_not_load_llm_clients():
+    code = (
+        "import sys, app.cli.cli_app; "
+        "print(','.join(m for m in ('openai', 'httpx', 'redis', 'sqlalchemy') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_load_agents_cached_reloads_on_mtime_change(tmp_path):
+    import json
+    from app.cli.cli_app import _load_agents_cached
+
+    agent = {"name": "테스트", "personality": "philosopher", "system_prompt": "s", "description": "d"}
+    path = tmp_path / "agents.json"
+    path.write_text(json.dumps({"agents": {"a": agent}}), encoding="utf-8")
+    mtime = os.stat(path).st_mtime_ns
+
+    first = _load_agents_cached(str(path), mtime)
+    assert _load_agents_cached(str(path), mtime) is first
+    assert [a.id for a in first] == ["a"]
+
+    path.write_text(json.dumps({"agents": {"a": agent, "b": agent}}), encoding="utf-8")
+    os.utime(path, ns=(mtime + 1_000_000, mtime + 1_000_000))
+    second = _load_agents_cached(str(path), os.stat(path).st_mtime_ns)
+    assert [a.id for a in second] == ["a", "b"]
+
+
+def test_strip_speaker_prefix():
+    from app.cli.cli_app import CLIConversationViewer
+
+    viewer = CLIConversationViewer()
+    assert viewer._strip_speaker_prefix("루피", "[루피]: 안녕") == "안녕"
+    assert viewer._strip_speaker_prefix("루피", "루피님: 안녕") == "안녕"
+    assert viewer._strip_speaker_prefix("루피", "- 안녕") == "안녕"
+    assert viewer._strip_speaker_prefix("a.b", "axb 안녕") == "axb 안녕"
+    assert "루피" in viewer._strip_cache
+
+
+def test_strip_speaker_prefix_trims_mixed_leading_marks():
+    from app.cli.cli_app import CLIConversationViewer
+
+    viewer = CLIConversationViewer()
+    assert viewer._strip_speaker_prefix("루피", "루피: - * 안녕") == "안녕"
+
+
+def test_viewer_indexes_agents_by_id():
+    from app.cli.cli_app import CLIConversationViewer
+
+    viewer = CLIConversationViewer()
+    assert viewer.agents
+    assert viewer._agent_id_set == {agent.id for agent in viewer.agents}
+    assert all(viewer._agents_by_id[agent.id] is agent for agent in viewer.agents)
+
+
+def test_mask_secret():
+    from app.cli.cli_app import _mask_secret
+
+    assert _mask_secret("sk-abcdefghijklmnop") == "sk-a***op"
+    assert _mask_secret("short") == "***"
@@ -0,0 +1,94 @@
+import dataclasses
+import pytest
+from app.config import Settings, settings
+
+
+def test_settings_from_env_parses_types(monkeypatch, tmp_path):
+    monkeypatch.setenv("PORT", "9000")
+    monkeypatch.setenv("DEBUG", "yes")
+    monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+    config = Settings.from_env(str(tmp_path / ".env"))
+    assert config.port == 9000
+    assert config.debug is True
+    assert config.ollama_model is None
+    assert config.logging_config.level == config.log_level
+
+
+def test_settings_from_env_reports_missing(monkeypatch, tmp_path):
+    monkeypatch.delenv("HOST", raising=False)
+    with pytest.raises(ValueError, match="HOST"):
+        Settings.from_env(str(tmp_path / ".env"))
+
+
+def test_settings_is_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.port = 1
+
+
+def test_config_dicts_are_built_once():
+    assert settings.get_llm_config() is settings.llm_config
+    assert settings.get_memory_config() is settings.get_memory_config()
+    assert settings.get_conversation_config()["max_turns"] == settings.conversation_max_turns
+
+
+def test_uvicorn_log_config_reuses_formatter():
+    from app import logging_config
+
+    first = logging_config.get_uvicorn_log_config()
+    second = logging_config.get_uvicorn_log_config()
+    factories = [spec["()"] for config in (first, second) for spec in config["formatters"].values()]
+    assert all(factory() is logging_config._FORMATTER for factory in factories)
+
+
+def test_queue_handler_enqueues_without_handler_lock():
+    import logging
+    import queue
+    import threading
+    from app.logging_config import _RecordQueueHandler
+
+    log_queue = queue.SimpleQueue()
+    handler = _RecordQueueHandler(log_queue)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "메시지", None, None)
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with handler.lock:
+            locked.set()
+            release.wait(1)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(1)
+    # 다른 스레드가 핸들러 락을 잡고 있어도 막히지 않음
+    assert handler.handle(record)
+    release.set()
+    holder.join()
+    assert log_queue.get_nowait() is record
+
+
+def test_batch_file_buffer_writes_once_per_flush(tmp_path):
+    import logging
+    from app.logging_config import _BatchFileBuffer
+
+    target = logging.FileHandler(tmp_path / "app.log", encoding="utf-8")
+    target.setFormatter(logging.Formatter("%(message)s"))
+    writes = []
+    write = target.stream.write
+    target.stream.write = lambda data: (writes.append(data), write(data))[1]
+    buffer = _BatchFileBuffer(capacity=10, flushLevel=logging.ERROR, target=target)
+    for number in range(3):
+        buffer.handle(logging.LogRecord("test", logging.INFO, __file__, 1, f"메시지 {number}", None, None))
+    assert writes == []
+    buffer.flush()
+    assert writes == ["메시지 0\n메시지 1\n메시지 2\n"]
+    buffer.close()
+    target.close()
+    assert (tmp_path / "app.log").read_text(encoding="utf-8").splitlines() == ["메시지 0", "메시지 1", "메시지 2"]
+
+
+def test_env_example_leaves_optional_audit_file_empty():
+    from pathlib import Path
+    from dotenv import dotenv_values
+
+    values = dotenv_values(Path(__file__).resolve().parents[2] / ".env.example", encoding="utf-8")
+    assert values["LOG_AUDIT_FILE_PATH"] == ""
@@ -1,5 +1,8 @@
+import asyncio
+import pytest
 from app.models.conversation import Conversation, ConversationRequest
 
+
 def test_conversation_model_fields():
     conv = Conversation(
         id="testid",
@@ -17,6 +20,7 @@ def test_conversation_model_fields():
     assert conv.id == "testid"
     assert conv.status == "idle"
 
+
 def test_conversation_request_validation():
     req = ConversationRequest(
         title="테스트",
@@ -24,4 +28,148 @@ def test_conversation_request_validation():
         max_turns=10,
         topic="테스트 주제"
     )
-    assert req.max_turns == 10 
\ No newline at end of file
+    assert req.max_turns == 10
+
+
+@pytest.mark.asyncio
+async def test_in_memory_relevant_context_matches_substrings():
+    from app.models.agent import AgentMessage
+    from app.models.memory import InMemoryStorage
+
+    storage = InMemoryStorage()
+    contents = ["인공지능의 미래는 밝다", "오늘 날씨", "게임 개발과 인공지능", "Python rocks"]
+    for turn, content in enumerate(contents):
+        await storage.store_message("c", "a", AgentMessage(agent_id="a", content=content, timestamp=float(turn), turn_number=turn))
+
+    result = await storage.get_relevant_context("c", "인공지능 python")
+    assert [entry.message.content for entry in result] == ["인공지능의 미래는 밝다", "게임 개발과 인공지능", "Python rocks"]
+    result = await storage.get_relevant_context("c", "인공지능", limit=1)
+    assert [entry.message.content for entry in result] == ["게임 개발과 인공지능"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_locks_are_per_conversation():
+    from app.models.agent import AgentMessage
+    from app.models.memory import InMemoryStorage
+
+    storage = InMemoryStorage()
+    message = AgentMessage(agent_id="a", content="안녕", timestamp=0.0, turn_number=0)
+    await storage.store_message("other", "a", message)
+    with storage.locks["busy"]:
+        # 다른 대화는 잠긴 대화를 기다리지 않음 (락을 공유하면 스레드에서 막혀 시간 초과로 실패)
+        history = await asyncio.wait_for(asyncio.to_thread(storage.get_conversation_history_sync, "other"), timeout=1)
+    assert [entry.message for entry in history] == [message]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_history_is_bounded():
+    from app.models.agent import AgentMessage
+    from app.models.memory import InMemoryStorage
+
+    storage = InMemoryStorage(max_messages=3)
+    for turn in range(5):
+        agent_id = "a" if turn % 2 == 0 else "b"
+        await storage.store_message("c", agent_id, AgentMessage(agent_id=agent_id, content=f"메시지 m{turn}", timestamp=float(turn), turn_number=turn))
+
+    history = await storage.get_conversation_history("c", limit=10)
+    assert [entry.message.turn_number for entry in history] == [2, 3, 4]
+    assert [entry.message.turn_number for entry in await storage.get_conversation_history("c", limit=2)] == [3, 4]
+    assert [entry.message.turn_number for entry in await storage.get_agent_memory("a", "c", limit=10)] == [2, 4]
+    # 밀려난 메시지는 역색인에서도 빠짐
+    assert await storage.get_relevant_context("c", "m0") == []
+    assert [entry.message.turn_number for entry in await storage.get_relevant_context("c", "메시지")] == [2, 3, 4]
+
+
+def test_message_models_are_frozen():
+    from pydantic import ValidationError
+    from app.models.agent import AgentMessage
+    from app.models.conversation import ConversationStatus
+
+    message = AgentMessage(agent_id="a", content="안녕", timestamp=0.0, turn_number=0)
+    with pytest.raises(ValidationError):
+        message.content = "수정"
+    assert ConversationStatus.ACTIVE == "active"
+    assert f"{ConversationStatus.ACTIVE}" == "active"
+
+
+def test_message_timestamp_is_unix_time():
+    from datetime import datetime
+    from app.models.conversation import Message
+
+    message = Message(speaker="시스템", content="시작")
+    assert isinstance(message.timestamp, float)
+    assert message.model_dump()["timestamp_iso"] == datetime.fromtimestamp(message.timestamp).isoformat()
+    # 이전 형식으로 저장된 ISO 문자열도 읽을 수 있음
+    legacy = Message(speaker="시스템", content="시작", timestamp="2024-07-01T00:00:00")
+    assert legacy.timestamp == datetime(2024, 7, 1).timestamp()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_interns_ids():
+    from app.models.agent import AgentMessage
+    from app.models.memory import InMemoryStorage
+
+    storage = InMemoryStorage()
+    for turn in range(2):
+        agent_id = "".join(["agent", "_x"])  # 매번 새 문자열 객체
+        await storage.store_message("c", agent_id, AgentMessage(agent_id=agent_id, content="안녕", timestamp=float(turn), turn_number=turn))
+    first, second = await storage.get_conversation_history("c")
+    assert first.agent_id is second.agent_id
+
+
+def test_in_memory_sync_api_from_worker_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from app.models.agent import AgentMessage
+    from app.models.memory import InMemoryStorage
+
+    storage = InMemoryStorage()
+
+    def store(turn):
+        storage.store_message_sync("c", "a", AgentMessage(agent_id="a", content=f"메시지 {turn}", timestamp=float(turn), turn_number=turn))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(store, range(100)))
+    assert len(storage.get_conversation_history_sync("c", limit=200)) == 100
+    assert len(storage.get_relevant_context_sync("c", "메시지", limit=200)) == 100
+
+
+def test_streaming_message_is_mutable_message():
+    from app.models.conversation import Message, StreamingMessage
+
+    message = StreamingMessage(speaker="A", content="", turn_number=1)
+    assert isinstance(message, Message) and message.is_streaming
+    message.content = "안녕"
+    assert message.model_dump()["content"] == "안녕"
+
+
+def test_constructed_message_matches_validated_message():
+    from app.models.conversation import Message
+
+    kwargs = dict(speaker="시스템", content="대화가 중지되었습니다.", timestamp=1.0, turn_number=3)
+    constructed = Message.model_construct(**kwargs)
+    assert constructed.model_dump() == Message(**kwargs).model_dump()
+    assert Message.model_construct(speaker="A", content="").timestamp > 0
+
+
+def test_memory_backends_implement_async_interface():
+    from app.models.memory import InMemoryStorage
+    from app.services.memory_service import PostgreSQLStorage, RedisStorage
+
+    for storage_class in (InMemoryStorage, RedisStorage, PostgreSQLStorage):
+        assert not storage_class.__abstractmethods__
+
+
+@pytest.mark.asyncio
+async def test_in_memory_locks_do_not_leak():
+    from app.models.agent import AgentMessage
+    from app.models.memory import InMemoryStorage
+
+    storage = InMemoryStorage()
+    assert await storage.get_conversation_history("unknown") == []
+    assert await storage.get_agent_memory("a", "unknown") == []
+    assert await storage.get_relevant_context("unknown", "주제") == []
+    assert not storage.locks
+    await storage.store_message("c", "a", AgentMessage(agent_id="a", content="안녕", timestamp=0.0, turn_number=0))
+    assert set(storage.locks) == {"c"}
+    await storage.clear_conversation_memory("c")
+    assert not storage.locks and not storage.memories
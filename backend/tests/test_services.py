@@ -2,6 +2,9 @@ import pytest
 from app.services.conversation_service import conversation_service
 from app.models.conversation import ConversationRequest
 
+AGENT_IDS = [agent.id for agent in conversation_service.get_agents()]
+
+
 @pytest.mark.asyncio
 async def test_create_and_delete_conversation():
     req = ConversationRequest(
@@ -17,7 +20,477 @@ async def test_create_and_delete_conversation():
     result = await conversation_service.delete_conversation(conv.id)
     assert result is True
 
+
 @pytest.mark.asyncio
 async def test_delete_nonexistent_conversation():
     result = await conversation_service.delete_conversation("nonexistent_id")
-    assert result is False 
\ No newline at end of file
+    assert result is False
+
+
+def test_get_agent_by_id():
+    agents = conversation_service.get_agents()
+    assert agents
+    first = agents[0]
+    assert conversation_service.get_agent_by_id(first.id).name == first.name
+    assert conversation_service.get_agent_by_id("nonexistent_id") is None
+
+
+def test_get_agents_snapshot_is_shared_until_reload():
+    agents, by_id = conversation_service.get_agents_snapshot()
+    version = conversation_service.agents_version
+    again, again_by_id = conversation_service.get_agents_snapshot()
+    assert again is agents and again_by_id is by_id
+    assert conversation_service.agents_version == version
+    assert set(by_id) == {agent.id for agent in agents}
+
+    # 파일이 바뀌지 않았으면 get_agents도 다시 읽지 않음
+    assert conversation_service.get_agents() == list(agents)
+    assert conversation_service.agents_version == version
+
+    conversation_service._reload_agents()
+    assert conversation_service.agents_version == version + 1
+
+
+def test_add_message_callback_is_idempotent():
+    from app.services.conversation_service import ConversationService
+
+    service = ConversationService()
+    callback = lambda conversation_id, message: None
+    service.add_message_callback(callback)
+    service.add_message_callback(callback)
+    assert service.message_callbacks == ((callback, False),)
+
+
+@pytest.mark.asyncio
+async def test_end_conversation_wakes_message_event(conv):
+    event = conversation_service.get_message_event(conv.id)
+    assert not event.is_set()
+    await conversation_service.end_conversation(conv.id)
+    assert event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_continue_conversation_reports_status(conv):
+    success, status = await conversation_service.continue_conversation("nonexistent_id")
+    assert success is False
+    assert status == "error"
+
+    await conversation_service.end_conversation(conv.id)
+    assert await conversation_service.continue_conversation(conv.id) == (False, "ended")
+
+
+@pytest.mark.asyncio
+async def test_messages_since_returns_tail(conv):
+    assert conversation_service.messages_since(conv.id, 0) == ([], 0)
+    await conversation_service.end_conversation(conv.id)
+    new_messages, cursor = conversation_service.messages_since(conv.id, 0)
+    assert [m.content for m in new_messages] == ["대화가 종료되었습니다."]
+    assert conversation_service.messages_since(conv.id, cursor) == ([], cursor)
+
+
+@pytest.mark.asyncio
+async def test_get_conversation_returns_live_object(conv):
+    assert conversation_service.get_conversation(conv.id) is conv
+    await conversation_service.end_conversation(conv.id)
+    assert conv.status == "ended"
+
+
+@pytest.mark.asyncio
+async def test_end_conversation_interrupts_turn_interval(conv, monkeypatch):
+    import asyncio
+
+    waiter = asyncio.create_task(conversation_service.wait_turn_interval(conv.id))
+    await asyncio.sleep(0)
+    await conversation_service.end_conversation(conv.id)
+    assert await asyncio.wait_for(waiter, timeout=1) is True
+
+    # 시작 직후(첫 대기 전)에 들어온 중지도 이후의 대기를 바로 깨움
+    async def noop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(conversation_service, "_agent_speak", noop)
+    monkeypatch.setattr(conversation_service, "_auto_continue_conversation", noop)
+    assert await conversation_service.start_conversation(conv.id)
+    await conversation_service.stop_conversation(conv.id)
+    assert await asyncio.wait_for(conversation_service.wait_turn_interval(conv.id), timeout=1) is True
+
+
+@pytest.mark.asyncio
+async def test_conversation_serialization_round_trip(conv):
+    memory_service = conversation_service.memory_service
+    restored = memory_service._deserialize_conversation(memory_service._serialize_conversation(conv))
+    assert restored.id == conv.id
+    assert restored.topic == "테스트 주제"
+    assert restored.created_at == conv.created_at
+
+
+def test_service_getters_return_singletons():
+    from app.services import get_conversation_service, get_memory_service
+    from app.services.logging_service import get_logging_service
+
+    assert get_conversation_service() is conversation_service
+    assert get_memory_service() is conversation_service.memory_service
+    assert get_logging_service() is get_logging_service()
+
+
+def test_ecs_formatter_serializes_with_orjson():
+    import logging
+    import orjson
+    from app.services.logging_service import ECSFormatter
+
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "대화 시작", None, None)
+    record.details = {1: "정수 키", "obj": object}
+    line = ECSFormatter().format(record)
+    assert "대화 시작" in line
+    assert orjson.loads(line)["event"]["details"]["1"] == "정수 키"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("conv", [{"max_turns": 5, "topic": "집합 {a, b}"}], indirect=True)
+async def test_system_prompt_template_is_built_once(conv):
+    agent = conversation_service.get_agents()[0]
+    prompt = conversation_service._create_system_prompt(conv)
+    assert "- 주제: 집합 {a, b}" in prompt
+    assert f"- 현재 턴: 0/5\n- 참여자: {agent.name}" in prompt
+    template = conv._prompt_template
+    conv.current_turn = 4
+    prompt = conversation_service._create_system_prompt(conv)
+    assert "- 현재 턴: 4/5" in prompt and "이번 턴이 마지막입니다" in prompt
+    assert conv._prompt_template is template
+    assert "_prompt_template" not in conv.model_dump()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("conv", [{"max_turns": 0}], indirect=True)
+async def test_context_summary_folds_evicted_messages(conv, monkeypatch):
+    import dataclasses
+    from app.config import settings
+    from app.models.conversation import Message
+    from app.services import conversation_service as module
+
+    monkeypatch.setattr(module, "settings", dataclasses.replace(settings, conversation_context_limit=2, conversation_summary_batch=2))
+    calls = []
+
+    async def fake_generate_response(messages, system_prompt, **kwargs):
+        calls.append([message.content for message in messages])
+        return f"요약 {len(calls)}"
+
+    monkeypatch.setattr(conversation_service.llm_service, "generate_response", fake_generate_response)
+    for turn in range(3):
+        conv.messages.append(Message(speaker="a", content=f"m{turn}"))
+        await conversation_service._update_context_summary(conv)
+    # 창(2개) 밖으로 밀려난 메시지가 배치(2개)만큼 쌓이기 전에는 요약하지 않음
+    assert calls == []
+    conv.messages.append(Message(speaker="a", content="m3"))
+    await conversation_service._update_context_summary(conv)
+    assert calls == [["m0", "m1"]]
+    assert conv.summarized_count == 2
+    assert conversation_service._create_system_prompt(conv).endswith("이전 대화 요약:\n요약 1")
+
+
+@pytest.mark.asyncio
+async def test_background_saves_run_in_order(conv, monkeypatch):
+    import asyncio
+
+    service = conversation_service
+    order = []
+
+    async def slow_save(conv):
+        order.append(("start", len(order)))
+        await asyncio.sleep(0.01)
+        order.append(("end", len(order)))
+        return True
+
+    monkeypatch.setattr(service.memory_service, "save_conversation", slow_save)
+    service._save_in_background(conv)
+    service._save_in_background(conv)
+    assert conv.id in service._pending_saves
+    await service.flush_pending_saves()
+    # 두 번째 저장은 첫 번째 저장이 끝난 뒤 시작
+    assert [kind for kind, _ in order] == ["start", "end", "start", "end"]
+    assert service._pending_saves == {}
+
+
+class _FakeStream:
+    """chat.completions.create(stream=True) 응답을 흉내 내는 비동기 이터레이터"""
+
+    def __init__(self, pieces):
+        from types import SimpleNamespace
+        self._chunks = iter(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))]) for piece in pieces
+        )
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _fake_llm_service(pieces):
+    from types import SimpleNamespace
+    from app.services.llm_service import LLMService
+
+    service = LLMService()
+
+    async def create(**kwargs):
+        return _FakeStream(pieces)
+
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_stream_callback_coalesces_chunks():
+    service = _fake_llm_service(["안", "녕", None, "하", "세요"])
+    calls = []
+
+    async def callback(chunk, full_content):
+        calls.append((chunk, full_content))
+
+    result = await service.generate_response_stream([], "prompt", stream_callback=callback, stream_interval=60)
+    assert result == "안녕하세요"
+    # 첫 조각은 바로 전달하고, 나머지는 간격 안에 모였다가 종료 시 한 번에 전달
+    assert calls == [("안", "안"), ("녕하세요", "안녕하세요")]
+
+    calls.clear()
+    await _fake_llm_service(["a", "b"]).generate_response_stream([], "prompt", stream_callback=callback, stream_interval=0)
+    assert calls == [("a", "a"), ("b", "ab")]
+
+
+def test_format_messages_skips_system_speaker():
+    from app.models.conversation import Message
+    from app.services.llm_service import LLMService
+
+    service = LLMService()
+    messages = [Message(speaker="시스템", content="시작"), Message(speaker="A", content="안녕"), Message(speaker="B", content="반가워")]
+    service.provider = "vllm"
+    assert service._format_messages(messages, "규칙") == [{"role": "user", "content": "규칙\n\nA: 안녕\nB: 반가워"}]
+    service.provider = "openai"
+    assert service._format_messages(messages, "규칙") == [
+        {"role": "system", "content": "규칙"},
+        {"role": "user", "content": "A: 안녕"},
+        {"role": "user", "content": "B: 반가워"},
+    ]
+
+
+def test_llm_services_share_client():
+    from app.services.llm_service import LLMService, llm_service
+
+    assert LLMService().client is llm_service.client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("conv", [{"agent_ids": [AGENT_IDS[0], "nonexistent_id", AGENT_IDS[1]], "max_turns": 4}], indirect=True)
+async def test_next_agent_round_robin_skips_unknown_ids(conv):
+    agents = conversation_service.get_agents()[:2]
+    picked = []
+    for turn in range(4):
+        conv.current_turn = turn
+        picked.append(conversation_service._select_next_agent(conv).id)
+    assert picked == [agents[0].id, agents[1].id, agents[0].id, agents[1].id]
+
+
+@pytest.mark.asyncio
+async def test_async_callbacks_run_concurrently():
+    import asyncio
+    from app.models.conversation import Message
+    from app.services.conversation_service import ConversationService
+
+    service = ConversationService()
+    order = []
+
+    async def slow(conversation_id, message):
+        order.append("slow start")
+        await asyncio.sleep(0.01)
+        order.append("slow end")
+
+    async def fast(conversation_id, message):
+        order.append("fast")
+
+    async def failing(conversation_id, message):
+        raise RuntimeError("실패")
+
+    for callback in (slow, failing, fast):
+        service.add_message_callback(callback)
+    await service._execute_callbacks("c", Message(speaker="A", content="안녕"))
+    # 느린 콜백을 기다리지 않고 다음 콜백이 실행되며, 예외는 다른 콜백에 영향을 주지 않음
+    assert order == ["slow start", "fast", "slow end"]
+
+
+def test_format_messages_joins_system_prompt_sections():
+    from app.models.conversation import Message
+    from app.services.llm_service import LLMService
+
+    service = LLMService()
+    messages = [Message(speaker="A", content="안녕")]
+    service.provider = "vllm"
+    assert service._format_messages(messages, ("기본", "에이전트")) == service._format_messages(messages, "기본\n\n에이전트")
+    service.provider = "openai"
+    assert service._format_messages(messages, ("기본", "에이전트"))[0] == {"role": "system", "content": "기본\n\n에이전트"}
+
+
+@pytest.mark.asyncio
+async def test_record_message_updates_conversation(conv):
+    from app.models.conversation import Message
+
+    event = conversation_service.get_message_event(conv.id)
+    message = Message(speaker="A", content="안녕", timestamp=conv.created_at.timestamp() + 10)
+    conversation_service._record_message(conv, message, persist=False)
+    assert conv.messages[-1] is message
+    assert conv.updated_at.timestamp() == message.timestamp
+    assert event.is_set()
+
+
+def test_ecs_formatter_fields():
+    import logging
+    import orjson
+    from app.services.logging_service import ECSFormatter
+
+    formatter = ECSFormatter("svc", "9.9")
+    record = logging.LogRecord("test", logging.ERROR, __file__, 1, "실패", None, None)
+    record.__dict__.update(conversation_id="c1", turn_number=2, error_type="LLMError", error_message="시간 초과")
+    entry = orjson.loads(formatter.format(record))
+    assert entry["service"] == {"name": "svc", "version": "9.9"} and entry["ecs"] == {"version": "1.6.0"}
+    assert entry["labels"] == {"conversation_id": "c1", "turn_number": 2}
+    assert entry["error"] == {"type": "LLMError", "message": "시간 초과"}
+    assert "event" not in entry and "llm" not in entry
+
+    plain = orjson.loads(formatter.format(logging.LogRecord("test", logging.INFO, __file__, 1, "정보", None, None)))
+    assert "labels" not in plain and "error" not in plain
+
+
+def test_iso_timestamp_matches_datetime():
+    import random
+    from datetime import datetime
+    from app.services.logging_service import _iso_timestamp
+
+    base = datetime(2024, 7, 1, 12, 0, 0).timestamp()
+    samples = [base, base + 0.5, base + 0.9999996, base + 0.0000004] + [base + random.random() * 5 for _ in range(1000)]
+    for created in samples:
+        assert _iso_timestamp(created) == datetime.fromtimestamp(created).isoformat()
+
+
+def test_logging_service_skips_disabled_levels(monkeypatch):
+    import logging
+    from app.services.logging_service import get_logging_service
+
+    service = get_logging_service()
+    calls = []
+    monkeypatch.setattr(logging, "debug", lambda *args, **kwargs: calls.append(args))
+    level = service._logger.level
+    try:
+        service._logger.setLevel(logging.INFO)
+        service.log_debug("디버그", {"key": "value"})
+        assert calls == []
+        service._logger.setLevel(logging.DEBUG)
+        service.log_debug("디버그", {"key": "value"})
+        assert calls == [("디버그",)]
+    finally:
+        service._logger.setLevel(level)
+
+
+def test_parse_size():
+    from app.services.logging_service import get_logging_service
+
+    parse = get_logging_service()._parse_size
+    assert parse("10MB") == 10 * 1024 * 1024
+    assert parse("512kb") == 512 * 1024
+    assert parse("1 GB") == 1024 ** 3
+    assert parse("2048") == 2048
+    with pytest.raises(ValueError):
+        parse("ten MB")
+
+
+@pytest.fixture
+def log_records():
+    """로깅 서비스 로거로 나가는 레코드를 모음"""
+    import logging
+    from app.services.logging_service import get_logging_service
+
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    logger = get_logging_service()._logger
+    handler = ListHandler()
+    logger.addHandler(handler)
+    yield records
+    logger.removeHandler(handler)
+
+
+def test_log_methods_defer_message_formatting(log_records):
+    from app.services.logging_service import get_logging_service
+
+    get_logging_service().log_llm_request("m", 3, 100, 0.7, 1.234)
+    record = log_records[-1]
+    assert record.args == ("m", 3, 1.234)
+    assert record.getMessage() == "LLM 요청 - 모델: m, 메시지 수: 3, 응답 시간: 1.23초"
+
+
+def test_log_agent_message_writes_full_text_to_audit_file(log_records, monkeypatch, tmp_path):
+    import dataclasses
+    import hashlib
+    import orjson
+    from app.config import settings
+    from app.services import logging_service as module
+
+    audit_path = tmp_path / "audit" / "messages.jsonl"
+    monkeypatch.setattr(module, "settings", dataclasses.replace(
+        settings, log_include_agent_conversations=True, log_audit_file_path=str(audit_path)
+    ))
+    service = module.get_logging_service()
+    try:
+        service.log_agent_message("c1", "A", "긴 발화\n둘째 줄", 3)
+    finally:
+        service._audit_file.close()
+        service._audit_file = None
+    entry = orjson.loads(audit_path.read_bytes())
+    assert (entry["conversation_id"], entry["turn_number"], entry["message"]) == ("c1", 3, "긴 발화\n둘째 줄")
+    details = log_records[-1].details
+    assert "full_message" not in details
+    assert details["message_sha256"] == hashlib.sha256("긴 발화\n둘째 줄".encode()).hexdigest()
+    assert "긴 발화" not in log_records[-1].getMessage()
+
+
+@pytest.mark.asyncio
+async def test_agent_speak_broadcasts_before_background_summary(monkeypatch):
+    import asyncio
+    import dataclasses
+    from app.config import settings
+    from app.services import conversation_service as module
+    from app.services.conversation_service import ConversationService
+
+    monkeypatch.setattr(module, "settings", dataclasses.replace(
+        settings, enable_streaming=False, conversation_context_limit=1, conversation_summary_batch=1
+    ))
+    service = ConversationService()
+    release = asyncio.Event()
+
+    async def fake_generate_response(messages, system_prompt, **kwargs):
+        if isinstance(system_prompt, str) and "요약" in system_prompt:
+            await release.wait()
+            return "요약"
+        return "응답"
+
+    monkeypatch.setattr(service.llm_service, "generate_response", fake_generate_response)
+    agent = service.get_agents()[0]
+    conv = await service.create_conversation(
+        ConversationRequest(title="요약 순서", agent_ids=[agent.id], max_turns=0, topic="테스트 주제")
+    )
+    broadcast = []
+    service.add_message_callback(lambda conversation_id, message: broadcast.append(message.content))
+    for _ in range(2):
+        await service._agent_speak(conv, agent, "프롬프트")
+    # 요약 LLM 호출이 끝나지 않아도 최종 메시지는 이미 전송됨
+    assert broadcast == ["응답", "응답"]
+    assert conv.context_summary == "" and conv.id in service._pending_summaries
+    release.set()
+    await service._pending_summaries[conv.id]
+    assert conv.context_summary == "요약" and conv.summarized_count == 1
+    await service.delete_conversation(conv.id)
@@ -97,6 +97,9 @@ export default function Home() {
   // WebSocket 연결
   useEffect(() => {
     const websocket = new WebSocket('ws://localhost:8000/api/ws')
+    // 서버는 한 번 인코딩한 JSON 바이트를 바이너리 프레임으로 브로드캐스트함
+    websocket.binaryType = 'arraybuffer'
+    const decoder = new TextDecoder()
     
     websocket.onopen = () => {
       setIsConnected(true)
@@ -104,7 +107,14 @@ export default function Home() {
     }
     
     websocket.onmessage = (event) => {
-      const data = JSON.parse(event.data)
+      const raw = typeof event.data === 'string' ? event.data : decoder.decode(event.data)
+      const parsed = JSON.parse(raw)
+      // 서버는 짧은 시간에 쌓인 메시지를 JSON 배열 하나로 묶어 보낼 수 있음
+      const batch = Array.isArray(parsed) ? parsed : [parsed]
+      batch.forEach(handleMessage)
+    }
+    
+    const handleMessage = (data: any) => {
       logger.debug('WebSocket 메시지 수신:', data)
       
       if (data.type === 'new_message') {
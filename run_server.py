@@ -7,13 +7,14 @@ import sys
 import os
 import uvicorn
 
-# 프로젝트 루트를 Python 경로에 추가
+# backend 디렉터리를 Python 경로에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from backend.app.main import app
-from backend.app.config import settings
-from backend.app.services.logging_service import get_logging_service
-from backend.app.logging_config import setup_logging, get_uvicorn_log_config
+# 서비스 모듈들이 `app.*` 절대 경로로 import하므로 같은 이름으로 불러와야 한다.
+# (`backend.app.*`로 불러오면 설정/서비스/앱 모듈이 이름만 다른 사본으로 한 번 더 생성됨)
+from app.config import settings
+from app.services.logging_service import get_logging_service
+from app.logging_config import setup_logging, get_uvicorn_log_config
 
 if __name__ == "__main__":
     # ECS 로깅 설정 적용
@@ -42,10 +43,19 @@ if __name__ == "__main__":
         print("=" * 50)
     
     uvicorn.run(
-        "backend.app.main:app",
+        "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
-        log_level="info",
-        log_config=get_uvicorn_log_config()
+        log_level="warning",
+        # 요청마다 찍히는 access 로그와 프록시 헤더 처리 비활성화
+        access_log=False,
+        proxy_headers=False,
+        log_config=get_uvicorn_log_config(),
+        # uvicorn[standard]에 포함된 C 구현 이벤트 루프/HTTP 파서 사용 (uvloop는 Windows 미지원)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        # 브로드캐스트 프레임을 연결마다 따로 압축하지 않도록 permessage-deflate 비활성화
+        ws_per_message_deflate=False
     ) 
\ No newline at end of file